@@ -5,6 +5,7 @@ from starlette.routing import Mount
 from starlette.middleware.cors import CORSMiddleware
 import sys
 import os
+from typing import List, Dict, Any
 # Create an MCP server
 mcp = FastMCP("Calculator")
 
@@ -27,6 +28,34 @@ def divide(a: int, b: int) -> float:
         return "Error: Cannot divide by zero"
     return a / b
 
+# Operations available to calculate_batch, keyed by their tool names
+BATCH_OPERATIONS = {
+    "add": add,
+    "subtract": subtract,
+    "multiply": multiply,
+    "divide": divide,
+}
+
+@mcp.tool()
+def calculate_batch(operations: List[Dict[str, Any]]) -> List[Any]:
+    """Run many arithmetic operations in one call
+    
+    Args:
+        operations: List of {"op": "add" | "subtract" | "multiply" | "divide", "a": int, "b": int}
+    """
+    results = []
+    for operation in operations:
+        func = BATCH_OPERATIONS.get(operation.get("op"))
+        if func is None:
+            results.append(f"Error: Unknown operation '{operation.get('op')}'")
+        elif "a" not in operation or "b" not in operation:
+            results.append("Error: Operation requires 'a' and 'b'")
+        elif not all(isinstance(operation[key], int) and not isinstance(operation[key], bool) for key in ("a", "b")):
+            results.append("Error: Operands 'a' and 'b' must be integers")
+        else:
+            results.append(func(operation["a"], operation["b"]))
+    return results
+
 # Create Starlette application with the MCP SSE app mounted at the root
 app = Starlette(
     routes=[
@@ -37,9 +66,9 @@ app = Starlette(
 # Add CORS middleware to allow cross-origin requests (important for Chainlit)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=[""],  # For development; restrict in production
+    allow_origins=["*"],  # For development; restrict in production
     allow_credentials=True,
-    allow_methods=[""],
+    allow_methods=["*"],
     allow_headers=["*"],
 )
 
@@ -49,22 +78,6 @@ if __name__ == "__main__":
         # Web mode (SSE) - for Chainlit
         import uvicorn
         
-        # Create Starlette application
-        app = Starlette(
-            routes=[
-                Mount('/', app=mcp.sse_app()),
-            ]
-        )
-        
-        # Add CORS middleware
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-        
         # Get port from arguments or environment or default
         port = int(os.environ.get("MCP_PORT", 8001))
         if len(sys.argv) > 2:
@@ -73,8 +86,20 @@ if __name__ == "__main__":
             except ValueError:
                 pass
                 
+        # Use uvloop + httptools when installed; fall back to uvicorn's defaults otherwise
+        try:
+            import uvloop
+            loop = "uvloop"
+        except ImportError:
+            loop = "auto"
+        try:
+            import httptools
+            http = "httptools"
+        except ImportError:
+            http = "auto"
+                
         print(f"Starting Web MCP server on port {port}")
-        uvicorn.run(app, host="127.0.0.1", port=port)
+        uvicorn.run(app, host="127.0.0.1", port=port, loop=loop, http=http, access_log=False)
     else:
         # STDIO mode - for Claude Desktop
         print("Starting STDIO MCP server")
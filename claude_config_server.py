@@ -3,34 +3,152 @@ import os
 import json
 import datetime
 import re
+import copy
+import mmap
+import time
+import functools
+from collections import deque
+import threading
+import anyio
+from concurrent.futures import ThreadPoolExecutor
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 import sys
+import shutil
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Hardcoded paths for security (restrict access to only these directories)
 CONFIG_PATH = r"C:\Users\Administrator\AppData\Roaming\Claude\claude_desktop_config.json"
 LOGS_DIR = r"C:\Users\Administrator\AppData\Roaming\Claude\logs"
+_LOGS_DIR_REAL = os.path.realpath(LOGS_DIR)
+
+# Parsed config and its pretty-printed text, keyed by the file's (mtime, size)
+_CFG_CACHE = {"mtime": None, "data": None, "text": None}
+
+# Serializes config writers now that tools run on worker threads
+_CONFIG_WRITE_LOCK = threading.Lock()
+
+# Short-lived snapshot of the .log files in LOGS_DIR as (filename, size, mtime) tuples
+_LOG_LIST_TTL = 5.0
+_LOG_LIST_CACHE = {"t": 0.0, "entries": None}
+
+# Block size used when reading log files backwards from the end
+_TAIL_CHUNK_SIZE = 64 * 1024
+
+# Upper bound on log files scanned concurrently by search_logs
+_SEARCH_MAX_WORKERS = 8
+
+# Approximate size of the blocks search_logs decodes and scans at once
+_SEARCH_BLOCK_SIZE = 1024 * 1024
+
+# \A, \Z and lookarounds see past the line when run over a whole block, so
+# patterns using them are matched one line at a time instead
+_LINE_CONTEXT_PATTERN = re.compile(r'\\[AZ]|\(\?<?[=!]')
+
+# Shared pretty-printing encoder, built once instead of on every json.dumps call
+_pretty_json = json.JSONEncoder(indent=2, ensure_ascii=False, check_circular=False).encode
 
 # Create an MCP server
 mcp = FastMCP("ClaudeConfigTools")
 
+def _in_worker_thread(func):
+    """Run a blocking tool/resource handler on a worker thread.
+
+    Keeps file I/O off the event loop so one slow read doesn't stall other
+    SSE sessions. The wrapper keeps the handler's name, docstring and signature.
+    """
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(func, *args, **kwargs))
+    return wrapper
+
+def _config_loads(data):
+    """Parse JSON text or bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _config_dumps(config_data) -> bytes:
+    """Serialize config data as 2-space indented UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(config_data, option=orjson.OPT_INDENT_2)
+    return _pretty_json(config_data).encode('utf-8')
+
+def _config_stamp():
+    st = os.stat(CONFIG_PATH)
+    return (st.st_mtime_ns, st.st_size)
+
+def _read_config_file():
+    """Parse CONFIG_PATH from disk.
+
+    With orjson the file is memory-mapped and parsed straight from the
+    mapping instead of being copied into a bytes object first.
+    """
+    with open(CONFIG_PATH, 'rb') as f:
+        # Empty files can't be mapped; let the parser report them
+        if orjson is None or os.fstat(f.fileno()).st_size == 0:
+            return _config_loads(f.read())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+def _load_config():
+    """Return (data, text) for the config file, re-reading it only when it changed on disk.
+
+    The returned dict is shared with the cache and must not be mutated.
+    """
+    stamp = _config_stamp()
+    if stamp != _CFG_CACHE["mtime"]:
+        config_data = _read_config_file()
+        _CFG_CACHE.update(mtime=stamp, data=config_data, text=_config_dumps(config_data).decode('utf-8'))
+    return _CFG_CACHE["data"], _CFG_CACHE["text"]
+
+def _write_config_file(config_data):
+    """Atomically replace CONFIG_PATH with config_data and refresh the cache.
+
+    The payload is written to a sibling temp file, fsynced and swapped in with
+    os.replace, so readers never see a half-written config.
+    """
+    payload = _config_dumps(config_data)
+    tmp_path = f"{CONFIG_PATH}.tmp.{os.getpid()}.{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, CONFIG_PATH)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    
+    _CFG_CACHE.update(mtime=_config_stamp(), data=config_data, text=payload.decode('utf-8'))
+
 # --- Config File Management Tools ---
 
 @mcp.tool()
+@_in_worker_thread
 def read_config() -> str:
     """Read the current Claude Desktop configuration file."""
     try:
         if os.path.exists(CONFIG_PATH):
-            with open(CONFIG_PATH, 'r') as f:
-                config_data = json.load(f)
-            return json.dumps(config_data, indent=2)
+            return _load_config()[1]
         else:
             return f"Error: Config file not found at {CONFIG_PATH}"
     except Exception as e:
         return f"Error reading config file: {str(e)}"
 
 @mcp.tool()
+@_in_worker_thread
 def write_config(config_json: str) -> str:
     """Update the Claude Desktop configuration file.
     
@@ -38,28 +156,27 @@ def write_config(config_json: str) -> str:
         config_json: JSON string with complete configuration
     """
     try:
-        # Validate JSON
-        try:
-            config_data = json.loads(config_json)
-        except json.JSONDecodeError as e:
-            return f"Error: Invalid JSON format - {str(e)}"
-        
-        # Create backup of current config
-        if os.path.exists(CONFIG_PATH):
-            backup_path = f"{CONFIG_PATH}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
-            with open(CONFIG_PATH, 'r') as src:
-                with open(backup_path, 'w') as dst:
-                    dst.write(src.read())
-        
-        # Write new config
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(config_data, f, indent=2)
-        
-        return f"Configuration updated successfully. Backup created at {backup_path}"
+        with _CONFIG_WRITE_LOCK:
+            # Validate JSON
+            try:
+                config_data = _config_loads(config_json)
+            except json.JSONDecodeError as e:
+                return f"Error: Invalid JSON format - {str(e)}"
+            
+            # Create backup of current config
+            if os.path.exists(CONFIG_PATH):
+                backup_path = f"{CONFIG_PATH}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+                shutil.copyfile(CONFIG_PATH, backup_path)
+            
+            # Write new config
+            _write_config_file(config_data)
+            
+            return f"Configuration updated successfully. Backup created at {backup_path}"
     except Exception as e:
         return f"Error updating config file: {str(e)}"
 
 @mcp.tool()
+@_in_worker_thread
 def update_config_property(property_path: str, value: str) -> str:
     """Update a specific property in the Claude Desktop configuration.
     
@@ -68,50 +185,109 @@ def update_config_property(property_path: str, value: str) -> str:
         value: New value for the property (will be parsed as JSON if possible)
     """
     try:
-        # Read current config
-        if not os.path.exists(CONFIG_PATH):
-            return f"Error: Config file not found at {CONFIG_PATH}"
-        
-        with open(CONFIG_PATH, 'r') as f:
-            config_data = json.load(f)
-        
-        # Create backup
-        backup_path = f"{CONFIG_PATH}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
-        with open(backup_path, 'w') as f:
-            json.dump(config_data, f, indent=2)
-        
-        # Parse the property path
-        parts = property_path.split('.')
-        
-        # Try to parse value as JSON, fall back to string if not valid JSON
-        try:
-            parsed_value = json.loads(value)
-        except json.JSONDecodeError:
-            parsed_value = value
-        
-        # Navigate to the right spot in the config
-        current = config_data
-        for i, part in enumerate(parts):
-            if i == len(parts) - 1:
-                # Last part - set the value
-                current[part] = parsed_value
-            else:
-                # Create nested dicts if they don't exist
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
-        
-        # Write updated config
-        with open(CONFIG_PATH, 'w') as f:
-            json.dump(config_data, f, indent=2)
-        
-        return f"Property {property_path} updated successfully. Backup created at {backup_path}"
+        with _CONFIG_WRITE_LOCK:
+            # Read current config
+            if not os.path.exists(CONFIG_PATH):
+                return f"Error: Config file not found at {CONFIG_PATH}"
+            
+            # Create a byte-identical backup of the file as it is on disk
+            backup_path = f"{CONFIG_PATH}.bak.{datetime.datetime.now().strftime('%Y%m%d%H%M%S')}"
+            shutil.copyfile(CONFIG_PATH, backup_path)
+            
+            # Work on a copy so the cached config stays intact if the update fails
+            config_data = copy.deepcopy(_load_config()[0])
+            
+            # Parse the property path
+            *parents, leaf = property_path.split('.')
+            
+            # Try to parse value as JSON, fall back to string if not valid JSON
+            try:
+                parsed_value = _config_loads(value)
+            except json.JSONDecodeError:
+                parsed_value = value
+            
+            # Navigate to the right spot in the config, creating nested dicts as needed
+            current = config_data
+            for part in parents:
+                current = current.setdefault(part, {})
+            current[leaf] = parsed_value
+            
+            # Write updated config
+            _write_config_file(config_data)
+            
+            return f"Property {property_path} updated successfully. Backup created at {backup_path}"
     except Exception as e:
         return f"Error updating config property: {str(e)}"
 
 # --- Log File Management Tools ---
 
+def _list_logs():
+    """Return (filename, size, mtime) for each .log file in LOGS_DIR.
+
+    The listing is reused for _LOG_LIST_TTL seconds so back-to-back log tools
+    don't re-list and re-stat the whole directory.
+    """
+    now = time.monotonic()
+    if _LOG_LIST_CACHE["entries"] is None or now - _LOG_LIST_CACHE["t"] >= _LOG_LIST_TTL:
+        entries = []
+        # DirEntry caches its stat result, so each file costs one stat at most
+        with os.scandir(LOGS_DIR) as it:
+            for entry in it:
+                if entry.name.endswith('.log') and entry.is_file():
+                    st = entry.stat()
+                    entries.append((entry.name, st.st_size, st.st_mtime))
+        _LOG_LIST_CACHE.update(t=now, entries=entries)
+    return _LOG_LIST_CACHE["entries"]
+
+def _safe_log_path(filename):
+    """Resolve a log filename to its path inside LOGS_DIR.
+    
+    Raises:
+        ValueError: If the name is not a bare .log filename that resolves inside LOGS_DIR
+    """
+    if filename != os.path.basename(filename):
+        raise ValueError("Invalid filename")
+    
+    # Only allow .log files
+    if not filename.endswith('.log'):
+        raise ValueError("Only .log files are allowed")
+    
+    # Reject anything that resolves outside the logs directory (e.g. "..", symlinks)
+    file_path = os.path.realpath(os.path.join(_LOGS_DIR_REAL, filename))
+    if not file_path.startswith(_LOGS_DIR_REAL + os.sep):
+        raise ValueError("Invalid filename")
+    
+    return file_path
+
+def _read_tail(file_path, max_lines):
+    """Return the last max_lines lines of a file as text.
+
+    Reads fixed-size blocks backwards from the end of the file until enough
+    newlines have been seen, so only the tail is pulled into memory. A
+    non-positive max_lines returns the whole file.
+    """
+    with open(file_path, 'rb') as f:
+        pos = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # One extra newline is needed so the first kept line is complete
+        while pos > 0 and (max_lines <= 0 or newlines <= max_lines):
+            step = min(_TAIL_CHUNK_SIZE, pos)
+            pos -= step
+            f.seek(pos)
+            chunk = f.read(step)
+            newlines += chunk.count(b'\n')
+            chunks.append(chunk)
+    
+    # Fixed-size ring buffer keeps only the last max_lines lines
+    lines = deque(b''.join(reversed(chunks)).splitlines(keepends=True), maxlen=max_lines if max_lines > 0 else None)
+    
+    # Match text-mode reads: decode leniently and translate universal newlines
+    text = b''.join(lines).decode('utf-8', errors='replace')
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
 @mcp.tool()
+@_in_worker_thread
 def list_log_files() -> str:
     """List all available log files in the Claude Desktop logs directory."""
     try:
@@ -119,22 +295,20 @@ def list_log_files() -> str:
             return f"Error: Logs directory not found at {LOGS_DIR}"
         
         log_files = []
-        for filename in os.listdir(LOGS_DIR):
-            if filename.endswith('.log'):
-                file_path = os.path.join(LOGS_DIR, filename)
-                size = os.path.getsize(file_path)
-                modified = datetime.datetime.fromtimestamp(os.path.getmtime(file_path))
-                log_files.append({
-                    "filename": filename,
-                    "size_bytes": size,
-                    "modified": modified.strftime("%Y-%m-%d %H:%M:%S")
-                })
+        for filename, size, mtime in _list_logs():
+            modified = datetime.datetime.fromtimestamp(mtime)
+            log_files.append({
+                "filename": filename,
+                "size_bytes": size,
+                "modified": modified.strftime("%Y-%m-%d %H:%M:%S")
+            })
         
-        return json.dumps(log_files, indent=2)
+        return _pretty_json(log_files)
     except Exception as e:
         return f"Error listing log files: {str(e)}"
 
 @mcp.tool()
+@_in_worker_thread
 def read_log_file(filename: str, max_lines: int = 100) -> str:
     """Read contents of a specific log file.
     
@@ -144,31 +318,83 @@ def read_log_file(filename: str, max_lines: int = 100) -> str:
     """
     try:
         # Validate filename to prevent directory traversal
-        if '..' in filename or '/' in filename or '\\' in filename:
-            return "Error: Invalid filename"
-        
-        # Only allow .log files
-        if not filename.endswith('.log'):
-            return "Error: Only .log files are allowed"
-        
-        file_path = os.path.join(LOGS_DIR, filename)
+        file_path = _safe_log_path(filename)
         
         if not os.path.exists(file_path):
             return f"Error: Log file not found: {filename}"
         
-        # Read the last max_lines lines from the file
-        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-            lines = f.readlines()
-            
-        # Get the last max_lines
-        if len(lines) > max_lines:
-            lines = lines[-max_lines:]
-            
-        return ''.join(lines)
+        # Read the last max_lines lines from the end of the file
+        return _read_tail(file_path, max_lines)
+    except ValueError as e:
+        return f"Error: {str(e)}"
     except Exception as e:
         return f"Error reading log file: {str(e)}"
 
+def _scan_log_file(filename, regex, block_regex, max_results):
+    """Return up to max_results lines of one log file that match regex.
+    
+    The file is memory-mapped and scanned in blocks that end on a line
+    boundary. block_regex (the same pattern with re.MULTILINE) runs over each
+    decoded block, and only the lines it lands on are cut out and checked
+    with regex, so lines without a match are never materialized. If
+    block_regex is None every line of the block is checked with regex.
+    """
+    matches = []
+    with open(os.path.join(LOGS_DIR, filename), 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return matches
+        
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            line_num = 1
+            start = 0
+            while start < size and len(matches) < max_results:
+                # Extend the block to the end of the line it stops in
+                end = start + _SEARCH_BLOCK_SIZE
+                if end < size:
+                    newline = mm.find(b'\n', end)
+                    end = size if newline == -1 else newline + 1
+                else:
+                    end = size
+                
+                # Same decoding and newline translation as a text-mode read
+                text = mm[start:end].decode('utf-8', errors='replace')
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+                
+                pos = 0
+                counted = 0
+                while pos < len(text) and len(matches) < max_results:
+                    if block_regex is None:
+                        match_start = pos
+                    else:
+                        m = block_regex.search(text, pos)
+                        # An empty match after the final newline belongs to no line
+                        if m is None or (m.start() == len(text) and text.endswith('\n')):
+                            break
+                        match_start = m.start()
+                    
+                    line_start = text.rfind('\n', 0, match_start) + 1
+                    line_end = text.find('\n', match_start)
+                    line_end = len(text) if line_end == -1 else line_end + 1
+                    line_num += text.count('\n', counted, line_start)
+                    counted = line_start
+                    
+                    # Re-check on the line alone; a block match may span lines
+                    line = text[line_start:line_end]
+                    if regex.search(line):
+                        matches.append({
+                            "file": filename,
+                            "line": line_num,
+                            "content": line.strip()
+                        })
+                    pos = line_end
+                
+                line_num += text.count('\n', counted)
+                start = end
+    return matches
+
 @mcp.tool()
+@_in_worker_thread
 def search_logs(pattern: str, max_results: int = 100) -> str:
     """Search across all log files for a specific pattern.
     
@@ -180,35 +406,37 @@ def search_logs(pattern: str, max_results: int = 100) -> str:
         if not os.path.exists(LOGS_DIR):
             return f"Error: Logs directory not found at {LOGS_DIR}"
         
+        # Compile once instead of looking the pattern up for every line
+        try:
+            regex = re.compile(pattern)
+            block_regex = None if _LINE_CONTEXT_PATTERN.search(pattern) else re.compile(pattern, re.MULTILINE)
+        except re.error as e:
+            return f"Error: Invalid regex pattern - {str(e)}"
+        
+        filenames = [entry[0] for entry in _list_logs()]
         results = []
-        for filename in os.listdir(LOGS_DIR):
-            if filename.endswith('.log'):
-                file_path = os.path.join(LOGS_DIR, filename)
-                
-                with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
-                    for line_num, line in enumerate(f, 1):
-                        if re.search(pattern, line):
-                            results.append({
-                                "file": filename,
-                                "line": line_num,
-                                "content": line.strip()
-                            })
-                            
-                            if len(results) >= max_results:
-                                break
-                
-                if len(results) >= max_results:
-                    break
+        if filenames:
+            # Scan files concurrently, but merge in listing order so the
+            # results match a sequential scan
+            with ThreadPoolExecutor(max_workers=min(_SEARCH_MAX_WORKERS, len(filenames))) as executor:
+                futures = [executor.submit(_scan_log_file, name, regex, block_regex, max_results) for name in filenames]
+                for future in futures:
+                    results.extend(future.result())
+                    if len(results) >= max_results:
+                        del results[max_results:]
+                        for pending in futures:
+                            pending.cancel()
+                        break
         
         if results:
-            return json.dumps(results, indent=2)
+            return _pretty_json(results)
         else:
             return f"No matches found for pattern: {pattern}"
     except Exception as e:
         return f"Error searching log files: {str(e)}"
 
 @mcp.tool()
-def tail_mcp_logs(lines: int = 50) -> str:
+async def tail_mcp_logs(lines: int = 50) -> str:
     """Read the last lines from MCP logs.
     
     This is a convenience function to quickly access recent MCP logs.
@@ -217,46 +445,38 @@ def tail_mcp_logs(lines: int = 50) -> str:
         lines: Number of lines to read from the end of the file
     """
     try:
-        log_files = []
-        for filename in os.listdir(LOGS_DIR):
-            if filename.startswith('mcp') and filename.endswith('.log'):
-                log_files.append(filename)
+        log_files = [entry for entry in await anyio.to_thread.run_sync(_list_logs) if entry[0].startswith('mcp')]
         
         if not log_files:
             return "No MCP log files found"
         
         # Find the most recent log file
-        log_files.sort(key=lambda f: os.path.getmtime(os.path.join(LOGS_DIR, f)), reverse=True)
-        latest_log = log_files[0]
+        latest_log = max(log_files, key=lambda entry: entry[2])[0]
         
-        return f"Contents of {latest_log} (last {lines} lines):\n\n" + read_log_file(latest_log, lines)
+        return f"Contents of {latest_log} (last {lines} lines):\n\n" + await read_log_file(latest_log, lines)
     except Exception as e:
         return f"Error reading MCP logs: {str(e)}"
 
 # --- Resource Endpoints ---
 
 @mcp.resource("claude://config")
+@_in_worker_thread
 def get_config_resource() -> str:
     """Provide the Claude Desktop configuration as a resource."""
     try:
-        with open(CONFIG_PATH, 'r') as f:
-            config_data = json.load(f)
-        return json.dumps(config_data, indent=2)
+        return _load_config()[1]
     except Exception as e:
         return f"Error reading config: {str(e)}"
 
 @mcp.resource("claude://logs/{filename}")
+@_in_worker_thread
 def get_log_resource(filename: str) -> str:
     """Provide a specific log file as a resource."""
     # Validate filename
-    if '..' in filename or '/' in filename or '\\' in filename:
-        return "Error: Invalid filename"
-    
-    # Only allow .log files
-    if not filename.endswith('.log'):
-        return "Error: Only .log files are allowed"
-    
-    file_path = os.path.join(LOGS_DIR, filename)
+    try:
+        file_path = _safe_log_path(filename)
+    except ValueError as e:
+        return f"Error: {str(e)}"
     
     try:
         if os.path.exists(file_path):
@@ -289,22 +509,6 @@ if __name__ == "__main__":
         # Web mode (SSE)
         import uvicorn
         
-        # Create Starlette application
-        app = Starlette(
-            routes=[
-                Mount('/', app=mcp.sse_app()),
-            ]
-        )
-        
-        # Add CORS middleware
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-        
         # Get port from arguments or environment or default
         port = int(os.environ.get("MCP_PORT", 8002))
         if len(sys.argv) > 2:
@@ -313,8 +517,20 @@ if __name__ == "__main__":
             except ValueError:
                 pass
                 
+        # Use uvloop + httptools when installed; fall back to uvicorn's defaults otherwise
+        try:
+            import uvloop
+            loop = "uvloop"
+        except ImportError:
+            loop = "auto"
+        try:
+            import httptools
+            http = "httptools"
+        except ImportError:
+            http = "auto"
+                
         print(f"Starting Web MCP server on port {port}")
-        uvicorn.run(app, host="127.0.0.1", port=port)
+        uvicorn.run(app, host="127.0.0.1", port=port, loop=loop, http=http, access_log=False)
     else:
         # STDIO mode - for Claude Desktop
         print("Starting STDIO MCP server")
@@ -1,16 +1,27 @@
 from mcp.server.fastmcp import FastMCP
 import os
 import sys
-import datetime
 import json
 import platform
+import re
 import subprocess
 import shutil
+import tempfile
+import stat
+import threading
+import time
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Determine base directory based on OS
 system = platform.system()
@@ -24,80 +35,386 @@ else:  # Linux or other
 # Create the base directory if it doesn't exist
 os.makedirs(BASE_DIR, exist_ok=True)
 
+# Normalized base directory and the prefix every path below it starts with;
+# computed once so containment checks are a single startswith
+BASE_DIR_ABS = os.path.abspath(BASE_DIR)
+BASE_DIR_PREFIX = os.path.join(BASE_DIR_ABS, '')
+
+# Absolute path to git, resolved once; an absolute executable (with no cwd and
+# close_fds=False) lets subprocess launch git via posix_spawn instead of fork+exec
+GIT_EXECUTABLE = shutil.which("git") or "git"
+
 # Create an MCP server
 mcp = FastMCP("DeveloperTools")
 
+# Match a path ending in ".env", and a ".env" path segment anywhere in a
+# normalized path. Windows and macOS file systems are case-insensitive by
+# default, so ".ENV" names the same file there and must be caught too.
+_ENV_RE_FLAGS = re.IGNORECASE if system in ("Windows", "Darwin") else 0
+_PATH_SEPS = re.escape(os.sep + (os.altsep or ''))
+ENV_FILE_RE = re.compile(r'\.env\Z', _ENV_RE_FLAGS)
+ENV_SEGMENT_RE = re.compile(rf'(?:^|[{_PATH_SEPS}])\.env(?:[{_PATH_SEPS}]|$)', _ENV_RE_FLAGS)
+
+# Full paths recently found missing -> time.monotonic() of the miss, so clients
+# polling for a path that isn't there don't stat it on every call
+MISSING_PATH_TTL = 1.0
+MISSING_PATH_CACHE_SIZE = 4096
+_missing_paths: Dict[str, float] = {}
+
+@functools.lru_cache(maxsize=4096)
+def check_path(path):
+    """Normalize a path and apply validate_path's checks.
+    
+    Returns (full_path, None), or (None, message) when the path is rejected.
+    The result depends only on the path string, so it is memoized; rejections
+    are returned rather than raised so that they are cached too.
+    """
+    # Normalize the path
+    full_path = os.path.normpath(os.path.join(BASE_DIR_ABS, path))
+    
+    # Block traversal (e.g. "../x") and absolute paths outside the base directory
+    if full_path != BASE_DIR_ABS and not full_path.startswith(BASE_DIR_PREFIX):
+        return None, "Access denied: Path is outside the base directory"
+    
+    # Check if the path is a .env file or has .env extension (the basename
+    # ends with ".env" exactly when the normalized path does)
+    if ENV_FILE_RE.search(full_path):
+        return None, "Access denied: .env files are not accessible for security reasons"
+    
+    # Additional check for any path segment being .env
+    if ENV_SEGMENT_RE.search(full_path):
+        return None, "Access denied: Paths containing .env directories are not accessible"
+    
+    return full_path, None
+
 def validate_path(path):
     """
     Validate a file path and check security constraints.
     
     This function:
     1. Normalizes the path
-    2. Blocks access to any .env files
-    3. Returns the full path
+    2. Blocks paths that resolve outside the base directory
+    3. Blocks access to any .env files
+    4. Returns the full path
     """
-    # Normalize the path
-    full_path = os.path.normpath(os.path.join(BASE_DIR, path))
+    full_path, error = check_path(path)
+    if error:
+        raise ValueError(error)
+    return full_path
+
+def stat_or_none(full_path: str) -> Optional[os.stat_result]:
+    """Return os.stat(full_path), or None where os.path.exists would be False.
     
-    # Check if the path is a .env file or has .env extension
-    if (os.path.basename(full_path) == '.env' or 
-        os.path.splitext(full_path)[1] == '.env' or
-        os.path.basename(full_path).endswith('.env')):
-        raise ValueError("Access denied: .env files are not accessible for security reasons")
+    Misses are remembered for MISSING_PATH_TTL seconds; anything that creates
+    files must call forget_missing_path() or forget_missing_paths().
+    """
+    missed_at = _missing_paths.get(full_path)
+    if missed_at is not None and time.monotonic() - missed_at < MISSING_PATH_TTL:
+        return None
     
-    # Additional check for any path segment being .env
-    path_parts = os.path.normpath(path).split(os.sep)
-    if '.env' in path_parts:
-        raise ValueError("Access denied: Paths containing .env directories are not accessible")
+    try:
+        return os.stat(full_path)
+    except (OSError, ValueError):
+        if len(_missing_paths) >= MISSING_PATH_CACHE_SIZE:
+            _missing_paths.clear()
+        _missing_paths[full_path] = time.monotonic()
+        return None
+
+def forget_missing_path(full_path: str):
+    """Drop cached misses for a newly created path and its (possibly new) ancestors"""
+    while True:
+        _missing_paths.pop(full_path, None)
+        parent = os.path.dirname(full_path)
+        if parent == full_path:
+            break
+        full_path = parent
+
+def forget_missing_paths():
+    """Drop all cached misses (e.g. after a git command that may touch many files)"""
+    _missing_paths.clear()
+
+def dumps_indented(data) -> str:
+    """Serialize data as 2-space indented JSON, via orjson when it's installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. undecodable file names (lone surrogates); json escapes those
+            pass
+    return json.dumps(data, indent=2)
+
+def encode_text(content: str) -> bytes:
+    """Encode text the way a text-mode write would (UTF-8, platform line endings)"""
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
+
+def write_file_bytes(full_path: str, data: bytes):
+    """Atomically replace full_path with data; the parent directory must exist.
     
-    return full_path
+    The data goes to a sibling temp file that is fsynced and swapped in with
+    os.replace, so concurrent readers see either the old or the new content.
+    """
+    # Write through symlinks, as an in-place write would, instead of replacing the link
+    if os.path.islink(full_path):
+        full_path = os.path.realpath(full_path)
+    try:
+        mode = stat.S_IMODE(os.stat(full_path).st_mode)
+    except OSError:
+        mode = None
+    
+    tmp_path = f"{full_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if mode is not None:
+            os.chmod(tmp_path, mode)  # keep the replaced file's permissions
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        forget_missing_path(full_path)
+
+def git_working_dir(subpath: str = None) -> str:
+    """Resolve the working directory for a git command.
+    
+    Raises:
+        ValueError: If subpath is invalid, missing, or outside the base directory
+    """
+    working_dir = BASE_DIR
+    
+    if subpath:
+        # Normalize the path to prevent directory traversal
+        norm_path = os.path.normpath(subpath)
+        
+        # Prevent escaping the repository with path traversal
+        if norm_path.startswith('..') or norm_path.startswith('/') or norm_path.startswith('\\'):
+            raise ValueError(f"Invalid path: {norm_path}")
+            
+        # Create full path by joining repository path with subfolder
+        working_dir = os.path.join(BASE_DIR, norm_path)
+        
+        # Ensure the path exists
+        if not os.path.exists(working_dir):
+            raise ValueError(f"Path does not exist: {norm_path}")
+        
+        # Final check to ensure we're still within the repository
+        abs_working_dir = os.path.abspath(working_dir)
+        if abs_working_dir != BASE_DIR_ABS and not abs_working_dir.startswith(BASE_DIR_PREFIX):
+            raise ValueError(f"Path is outside the base directory: {norm_path}")
+    
+    return working_dir
+
+class GitWorker:
+    """Long-running `git cat-file --batch-check` process for one working directory.
+    
+    Object and ref lookups (e.g. "does HEAD exist?") are written to the
+    process's stdin and answered on stdout, so repeated queries don't pay for
+    a new git process each time. The process is restarted if it exits.
+    """
+    
+    def __init__(self, working_dir: str):
+        self.working_dir = working_dir
+        self._lock = threading.Lock()
+        self._proc = None
+    
+    def lookup(self, rev: str) -> Optional[Tuple[str, str, int]]:
+        """Return (object name, type, size) for rev, or None if it doesn't exist.
+        
+        Raises:
+            RuntimeError: If the worker can't answer (e.g. not a git repository)
+        """
+        if '\n' in rev:
+            raise ValueError("Revision must not contain newlines")
+        
+        with self._lock:
+            if self._proc is None or self._proc.poll() is not None:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch-check"],
+                    cwd=self.working_dir,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            try:
+                self._proc.stdin.write(rev.encode('utf-8') + b'\n')
+                self._proc.stdin.flush()
+                line = self._proc.stdout.readline()
+            except OSError:
+                line = b''
+            
+            if not line:
+                self._close_locked()
+                raise RuntimeError(f"git cat-file exited in {self.working_dir}")
+        
+        parts = line.decode('utf-8', errors='replace').split()
+        # "<rev> missing" / "<rev> ambiguous"
+        if len(parts) != 3:
+            return None
+        return parts[0], parts[1], int(parts[2])
+    
+    def close(self):
+        with self._lock:
+            self._close_locked()
+    
+    def _close_locked(self):
+        if self._proc is not None:
+            if self._proc.poll() is None:
+                self._proc.stdin.close()
+                self._proc.wait()
+            self._proc = None
+
+# One GitWorker per working directory, created on first use
+_git_workers: Dict[str, GitWorker] = {}
+_git_workers_lock = threading.Lock()
+
+def get_git_worker(working_dir: str) -> GitWorker:
+    """Return the shared GitWorker for working_dir, creating it if needed"""
+    with _git_workers_lock:
+        worker = _git_workers.get(working_dir)
+        if worker is None:
+            worker = _git_workers[working_dir] = GitWorker(working_dir)
+        return worker
+
+def discard_git_worker(working_dir: str):
+    """Stop the GitWorker for working_dir (e.g. after the repository layout changed)"""
+    with _git_workers_lock:
+        worker = _git_workers.pop(working_dir, None)
+    if worker is not None:
+        worker.close()
+
+def git_head_missing(subpath: str = None) -> bool:
+    """Return True if the repository at subpath has no commits yet.
+    
+    Answered by the persistent GitWorker; returns False whenever the worker
+    can't tell, so callers fall back to running git normally.
+    """
+    try:
+        return get_git_worker(git_working_dir(subpath)).lookup("HEAD") is None
+    except (ValueError, RuntimeError, OSError):
+        return False
+
+_ASCII_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+def decode_output(data: bytes) -> str:
+    """Decode process output as UTF-8 with surrounding whitespace trimmed.
+    
+    The trim is done on indices and the decode reads a memoryview slice, so
+    large outputs (diffs, logs) are decoded once and never copied as bytes.
+    """
+    start, end = 0, len(data)
+    while start < end and data[start] in _ASCII_WHITESPACE:
+        start += 1
+    while end > start and data[end - 1] in _ASCII_WHITESPACE:
+        end -= 1
+    return str(memoryview(data)[start:end], 'utf-8', 'replace')
+
+# Working directory -> index_state() last seen with the index matching HEAD, so
+# committing again with an untouched index and HEAD can skip spawning git
+_clean_index_states: Dict[str, Tuple[str, int, int, int, str]] = {}
+
+def index_state(subpath: str = None) -> Optional[Tuple[str, int, int, int, str]]:
+    """Return (working dir, index mtime_ns, size, inode, HEAD object name), or None.
+    
+    None means the state can't be determined cheaply (not a repository root,
+    no commits yet, ...), and callers should just run git.
+    """
+    try:
+        working_dir = git_working_dir(subpath)
+        index_stat = os.stat(os.path.join(working_dir, '.git', 'index'))
+        head = get_git_worker(working_dir).lookup("HEAD")
+    except (ValueError, RuntimeError, OSError):
+        return None
+    if head is None:
+        return None
+    return (working_dir, index_stat.st_mtime_ns, index_stat.st_size, index_stat.st_ino, head[0])
 
 def run_git_command(args: List[str], subpath: str = None) -> Dict[str, Any]:
     """Run a git command and return structured result"""
     try:
         # Determine working directory
-        working_dir = BASE_DIR
+        try:
+            working_dir = git_working_dir(subpath)
+        except ValueError as e:
+            return {"success": False, "error": str(e)}
         
-        if subpath:
-            # Normalize the path to prevent directory traversal
-            norm_path = os.path.normpath(subpath)
-            
-            # Prevent escaping the repository with path traversal
-            if norm_path.startswith('..') or norm_path.startswith('/') or norm_path.startswith('\\'):
-                return {"success": False, "error": f"Invalid path: {norm_path}"}
-                
-            # Create full path by joining repository path with subfolder
-            working_dir = os.path.join(BASE_DIR, norm_path)
-            
-            # Ensure the path exists
-            if not os.path.exists(working_dir):
-                return {"success": False, "error": f"Path does not exist: {norm_path}"}
-            
-            # Final check to ensure we're still within the repository
-            if not os.path.abspath(working_dir).startswith(os.path.abspath(BASE_DIR)):
-                return {"success": False, "error": f"Path is outside the base directory: {norm_path}"}
-        
-        # Build the git command
-        cmd = ["git"] + args
-        
-        # Run the command
-        result = subprocess.run(
-            cmd, 
-            cwd=working_dir, 
-            text=True, 
-            capture_output=True, 
-            check=False
+        # Build the git command; -C replaces cwd= so the posix_spawn fast path applies
+        cmd = [GIT_EXECUTABLE, "-C", working_dir] + args
+        
+        # Run the command, keeping output as bytes until the final decode
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            close_fds=False
         )
+        stdout, stderr = proc.communicate()
+        
+        # checkout, init, etc. can create files anywhere in the tree
+        forget_missing_paths()
         
         return {
-            "success": result.returncode == 0,
-            "stdout": result.stdout.strip(),
-            "stderr": result.stderr.strip(),
-            "exit_code": result.returncode
+            "success": proc.returncode == 0,
+            "stdout": decode_output(stdout),
+            "stderr": decode_output(stderr),
+            "exit_code": proc.returncode
         }
     except Exception as e:
         return {"success": False, "error": f"Failed to execute git command: {str(e)}"}
 
+# Past either limit, pathspecs go through a temp file instead of argv (E2BIG)
+GIT_ADD_ARGV_MAX_PATHS = 1000
+GIT_ADD_ARGV_MAX_CHARS = 100_000
+
+def git_add_batch(pathspecs: List[str], subpath: str = None) -> Dict[str, Any]:
+    """Stage any number of pathspecs with a single `git add` invocation"""
+    if len(pathspecs) <= GIT_ADD_ARGV_MAX_PATHS and sum(map(len, pathspecs)) <= GIT_ADD_ARGV_MAX_CHARS:
+        return run_git_command(["add"] + pathspecs, subpath)
+    
+    try:
+        with tempfile.NamedTemporaryFile('wb', suffix='.pathspec', delete=False) as spec_file:
+            spec_file.write(b'\0'.join(os.fsencode(p) for p in pathspecs))
+    except Exception as e:
+        return {"success": False, "error": f"Failed to write pathspec file: {str(e)}"}
+    try:
+        return run_git_command(["add", f"--pathspec-from-file={spec_file.name}", "--pathspec-file-nul"], subpath)
+    finally:
+        os.unlink(spec_file.name)
+
+def commit_added_changes(add_result: Dict[str, Any], message: str, subpath: str = None) -> str:
+    """Commit after a `git add`, reporting the result the way git_commit_all does"""
+    if not add_result["success"]:
+        return f"❌ Failed to add files: {add_result.get('error', add_result['stderr'])}"
+    
+    # Neither the index nor HEAD moved since they last matched: nothing to commit
+    state = index_state(subpath)
+    if state is not None and _clean_index_states.get(state[0]) == state:
+        return "ℹ️ Nothing to commit - working directory is clean"
+    
+    commit_result = run_git_command(["commit", "-m", message], subpath)
+    
+    if commit_result["success"]:
+        response = f"✅ All changes added and committed successfully\n{commit_result['stdout']}"
+    else:
+        error_msg = commit_result.get('error', commit_result['stderr'])
+        # git reports this on stdout
+        if "nothing to commit" not in error_msg and "nothing to commit" not in commit_result.get('stdout', ''):
+            return f"❌ Failed to commit changes: {error_msg}"
+        response = "ℹ️ Nothing to commit - working directory is clean"
+    
+    state = index_state(subpath)
+    if state is not None:
+        _clean_index_states[state[0]] = state
+    return response
+
 # ===== FILE SYSTEM OPERATIONS =====
 
 @mcp.tool()
@@ -112,19 +429,21 @@ def copy_file(source_path: str, destination_path: str) -> str:
         source_full_path = validate_path(source_path)
         destination_full_path = validate_path(destination_path)
         
-        if not os.path.exists(source_full_path):
+        source_stat = stat_or_none(source_full_path)
+        if source_stat is None:
             return f"Error: Source file '{source_path}' does not exist"
         
-        if not os.path.isfile(source_full_path):
+        if not stat.S_ISREG(source_stat.st_mode):
             return f"Error: Source '{source_path}' is not a file"
             
         destination_dir = os.path.dirname(destination_full_path)
         os.makedirs(destination_dir, exist_ok=True)
         
-        if os.path.exists(destination_full_path):
+        if stat_or_none(destination_full_path) is not None:
             return f"Error: Destination '{destination_path}' already exists"
         
         shutil.copy2(source_full_path, destination_full_path)
+        forget_missing_path(destination_full_path)
         return f"File copied successfully from '{source_path}' to '{destination_path}'"
         
     except ValueError as e:
@@ -132,6 +451,47 @@ def copy_file(source_path: str, destination_path: str) -> str:
     except Exception as e:
         return f"Error: Failed to copy file: {str(e)}"
 
+def list_directory_entries(directory: str = "") -> List[Dict[str, Any]]:
+    """Return the name, type, size and modification time of each entry in directory.
+    
+    Raises:
+        ValueError: If the path is not allowed, missing, or not a directory
+    """
+    full_path = validate_path(directory)
+    
+    dir_stat = stat_or_none(full_path)
+    if dir_stat is None:
+        raise ValueError(f"Directory '{directory}' does not exist")
+    
+    if not stat.S_ISDIR(dir_stat.st_mode):
+        raise ValueError(f"'{directory}' is not a directory")
+    
+    result = []
+    # Files written together (checkouts, generated trees) share mtimes, so
+    # format each distinct second only once
+    formatted_mtimes: Dict[int, str] = {}
+    
+    # One stat per entry; type, size and mtime all come from it
+    with os.scandir(full_path) as entries:
+        for entry in entries:
+            entry_stat = entry.stat()
+            is_dir = stat.S_ISDIR(entry_stat.st_mode)
+            mtime = entry_stat.st_mtime_ns // 1_000_000_000
+            item_modified = formatted_mtimes.get(mtime)
+            if item_modified is None:
+                item_modified = formatted_mtimes[mtime] = time.strftime(
+                    "%Y-%m-%d %H:%M:%S", time.localtime(mtime)
+                )
+        
+            result.append({
+                "name": entry.name,
+                "type": "directory" if is_dir else "file",
+                "size": entry_stat.st_size if stat.S_ISREG(entry_stat.st_mode) else 0,
+                "modified": item_modified
+            })
+    
+    return result
+
 @mcp.tool()
 def list_files(directory: str = "") -> str:
     """List files and directories in the specified directory.
@@ -140,34 +500,8 @@ def list_files(directory: str = "") -> str:
         directory: The directory path relative to the base directory (default: root)
     """
     try:
-        full_path = validate_path(directory)
-        
-        if not os.path.exists(full_path):
-            return f"Error: Directory '{directory}' does not exist"
-        
-        if not os.path.isdir(full_path):
-            return f"Error: '{directory}' is not a directory"
-        
-        items = os.listdir(full_path)
-        result = []
-        
-        for item in items:
-            item_path = os.path.join(full_path, item)
-            item_type = "directory" if os.path.isdir(item_path) else "file"
-            item_size = os.path.getsize(item_path) if os.path.isfile(item_path) else 0
-            item_modified = datetime.datetime.fromtimestamp(
-                os.path.getmtime(item_path)
-            ).strftime("%Y-%m-%d %H:%M:%S")
-            
-            result.append({
-                "name": item,
-                "type": item_type,
-                "size": item_size,
-                "modified": item_modified
-            })
-        
-        return json.dumps(result, indent=2)
-        
+        return dumps_indented(list_directory_entries(directory))
+    
     except ValueError as e:
         return f"Error: {str(e)}"
     except Exception as e:
@@ -183,14 +517,20 @@ def read_file(path: str) -> str:
     try:
         full_path = validate_path(path)
         
-        if not os.path.exists(full_path):
+        file_stat = stat_or_none(full_path)
+        if file_stat is None:
             return f"Error: File '{path}' does not exist"
         
-        if not os.path.isfile(full_path):
+        if not stat.S_ISREG(file_stat.st_mode):
             return f"Error: '{path}' is not a file"
         
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Unbuffered read sizes one buffer from fstat; decode it in a single pass
+        with open(full_path, 'rb', buffering=0) as f:
+            content = f.read().decode('utf-8')
+        
+        # Match text-mode reads, which translate \r\n and \r to \n
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
         
         return content
         
@@ -215,8 +555,7 @@ def write_file(path: str, content: str) -> str:
         directory = os.path.dirname(full_path)
         os.makedirs(directory, exist_ok=True)
         
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        write_file_bytes(full_path, encode_text(content))
         
         return f"File '{path}' has been written successfully"
         
@@ -235,10 +574,11 @@ def delete_file(path: str) -> str:
     try:
         full_path = validate_path(path)
         
-        if not os.path.exists(full_path):
+        file_stat = stat_or_none(full_path)
+        if file_stat is None:
             return f"Error: File '{path}' does not exist"
         
-        if not os.path.isfile(full_path):
+        if not stat.S_ISREG(file_stat.st_mode):
             return f"Error: '{path}' is not a file"
         
         os.remove(full_path)
@@ -259,13 +599,15 @@ def create_directory(path: str) -> str:
     try:
         full_path = validate_path(path)
         
-        if os.path.exists(full_path):
-            if os.path.isdir(full_path):
+        existing = stat_or_none(full_path)
+        if existing is not None:
+            if stat.S_ISDIR(existing.st_mode):
                 return f"Directory '{path}' already exists"
             else:
                 return f"Error: '{path}' already exists as a file"
         
         os.makedirs(full_path, exist_ok=True)
+        forget_missing_path(full_path)
         return f"Directory '{path}' has been created successfully"
         
     except ValueError as e:
@@ -284,10 +626,11 @@ def delete_directory(path: str, recursive: bool = False) -> str:
     try:
         full_path = validate_path(path)
         
-        if not os.path.exists(full_path):
+        dir_stat = stat_or_none(full_path)
+        if dir_stat is None:
             return f"Error: Directory '{path}' does not exist"
         
-        if not os.path.isdir(full_path):
+        if not stat.S_ISDIR(dir_stat.st_mode):
             return f"Error: '{path}' is not a directory"
         
         if recursive:
@@ -308,6 +651,35 @@ def delete_directory(path: str, recursive: bool = False) -> str:
 
 # ===== GIT OPERATIONS =====
 
+def _classify_status_code(code: str) -> Optional[str]:
+    if code[0] in 'AMDRC':
+        return "staged"
+    if code[1] == 'M':
+        return "modified"
+    if code[1] == 'D':
+        return "deleted"
+    if code == '??':
+        return "untracked"
+    return None
+
+# Bucket for every two-letter `git status --porcelain` code, precomputed so
+# git_status classifies each line with a single dict lookup
+_STATUS_LETTERS = ' MTADRCU?!'
+GIT_STATUS_BUCKETS = {
+    x + y: _classify_status_code(x + y)
+    for x in _STATUS_LETTERS
+    for y in _STATUS_LETTERS
+    if _classify_status_code(x + y)
+}
+
+# Report sections in display order
+GIT_STATUS_SECTIONS = [
+    ("staged", "✅ Staged for commit"),
+    ("modified", "📝 Modified"),
+    ("deleted", "🗑️ Deleted"),
+    ("untracked", "❓ Untracked"),
+]
+
 @mcp.tool()
 def git_init(subpath: str = None) -> str:
     """Initialize a git repository.
@@ -317,76 +689,71 @@ def git_init(subpath: str = None) -> str:
     """
     result = run_git_command(["init"], subpath)
     
+    # A worker started before init may be bound to an enclosing repository
+    try:
+        discard_git_worker(git_working_dir(subpath))
+    except ValueError:
+        pass
+    
     if result["success"]:
         return f"✅ Git repository initialized successfully\n{result['stdout']}"
     else:
         return f"❌ Failed to initialize git repository: {result.get('error', result['stderr'])}"
 
-@mcp.tool()
-def git_status(subpath: str = None) -> str:
-    """Get the status of the git repository.
+def git_status_changes(subpath: str = None) -> Optional[Dict[str, List[str]]]:
+    """Return the changed paths grouped by GIT_STATUS_SECTIONS bucket, or None if clean.
     
-    Args:
-        subpath: Optional subfolder path relative to base directory
+    Raises:
+        RuntimeError: If `git status` fails
     """
     result = run_git_command(["status", "--porcelain"], subpath)
     
     if not result["success"]:
-        return f"❌ Failed to get git status: {result.get('error', result['stderr'])}"
+        raise RuntimeError(result["error"] if "error" in result else result["stderr"])
     
     # Parse porcelain output for better formatting
     status_lines = result["stdout"].split('\n') if result["stdout"] else []
     
     if not status_lines or not status_lines[0]:
-        return "✅ Working directory is clean - no changes to commit"
+        return None
     
-    changes = {
-        "staged": [],
-        "modified": [],
-        "untracked": [],
-        "deleted": []
-    }
+    changes = {bucket: [] for bucket, _ in GIT_STATUS_SECTIONS}
     
     for line in status_lines:
-        if len(line) < 3:
+        bucket = GIT_STATUS_BUCKETS.get(line[:2])
+        if bucket is None or len(line) < 3:
             continue
-            
-        status_code = line[:2]
-        file_path = line[3:]
-        
-        if status_code[0] in ['A', 'M', 'D', 'R', 'C']:
-            changes["staged"].append(f"{status_code[0]} {file_path}")
-        elif status_code[1] == 'M':
-            changes["modified"].append(file_path)
-        elif status_code[1] == 'D':
-            changes["deleted"].append(file_path)
-        elif status_code == '??':
-            changes["untracked"].append(file_path)
-    
-    result_text = ["📊 Git Repository Status:"]
-    
-    if changes["staged"]:
-        result_text.append(f"\n✅ Staged for commit ({len(changes['staged'])} files):")
-        for item in changes["staged"]:
-            result_text.append(f"   {item}")
+        changes[bucket].append(f"{line[0]} {line[3:]}" if bucket == "staged" else line[3:])
     
-    if changes["modified"]:
-        result_text.append(f"\n📝 Modified ({len(changes['modified'])} files):")
-        for item in changes["modified"]:
-            result_text.append(f"   {item}")
+    return changes
+
+def format_git_status(changes: Optional[Dict[str, List[str]]]) -> str:
+    """Render git_status_changes() output as the git_status report"""
+    if changes is None:
+        return "✅ Working directory is clean - no changes to commit"
     
-    if changes["deleted"]:
-        result_text.append(f"\n🗑️ Deleted ({len(changes['deleted'])} files):")
-        for item in changes["deleted"]:
-            result_text.append(f"   {item}")
+    result_text = ["📊 Git Repository Status:"]
     
-    if changes["untracked"]:
-        result_text.append(f"\n❓ Untracked ({len(changes['untracked'])} files):")
-        for item in changes["untracked"]:
-            result_text.append(f"   {item}")
+    for bucket, title in GIT_STATUS_SECTIONS:
+        items = changes[bucket]
+        if items:
+            result_text.append(f"\n{title} ({len(items)} files):")
+            result_text.extend(f"   {item}" for item in items)
     
     return "\n".join(result_text)
 
+@mcp.tool()
+def git_status(subpath: str = None) -> str:
+    """Get the status of the git repository.
+    
+    Args:
+        subpath: Optional subfolder path relative to base directory
+    """
+    try:
+        return format_git_status(git_status_changes(subpath))
+    except RuntimeError as e:
+        return f"❌ Failed to get git status: {str(e)}"
+
 @mcp.tool()
 def git_add_files(files: List[str], subpath: str = None) -> str:
     """Add files to the git staging area.
@@ -398,7 +765,7 @@ def git_add_files(files: List[str], subpath: str = None) -> str:
     if not files:
         return "❌ No files specified to add"
     
-    result = run_git_command(["add"] + files, subpath)
+    result = git_add_batch(files, subpath)
     
     if result["success"]:
         if files == ["."]:
@@ -440,21 +807,9 @@ def git_commit_all(message: str, subpath: str = None) -> str:
     if not message.strip():
         return "❌ Commit message cannot be empty"
     
-    # First add all files
+    # First add all files, then commit
     add_result = run_git_command(["add", "."], subpath)
-    if not add_result["success"]:
-        return f"❌ Failed to add files: {add_result.get('error', add_result['stderr'])}"
-    
-    # Then commit
-    commit_result = run_git_command(["commit", "-m", message], subpath)
-    
-    if commit_result["success"]:
-        return f"✅ All changes added and committed successfully\n{commit_result['stdout']}"
-    else:
-        error_msg = commit_result.get('error', commit_result['stderr'])
-        if "nothing to commit" in error_msg:
-            return "ℹ️ Nothing to commit - working directory is clean"
-        return f"❌ Failed to commit changes: {error_msg}"
+    return commit_added_changes(add_result, message, subpath)
 
 @mcp.tool()
 def git_log(limit: int = 10, subpath: str = None) -> str:
@@ -464,10 +819,14 @@ def git_log(limit: int = 10, subpath: str = None) -> str:
         limit: Maximum number of commits to show (default: 10)
         subpath: Optional subfolder path relative to base directory
     """
+    # Repositories without commits have no HEAD; skip spawning git log
+    if git_head_missing(subpath):
+        return "ℹ️ No commits found in this repository"
+    
     result = run_git_command([
         "log", 
         f"--max-count={limit}",
-        "--pretty=format:%h|%an|%ad|%s",
+        "--pretty=format:%h%x1f%an%x1f%ad%x1f%s",
         "--date=short"
     ], subpath)
     
@@ -480,13 +839,13 @@ def git_log(limit: int = 10, subpath: str = None) -> str:
     lines = result["stdout"].split('\n')
     result_text = [f"📜 Recent Commits (showing {len(lines)} of {limit} max):"]
     
-    for line in lines:
-        if '|' in line:
-            parts = line.split('|')
-            if len(parts) >= 4:
-                hash_short, author, date, message = parts[0], parts[1], parts[2], '|'.join(parts[3:])
-                result_text.append(f"  🔹 {hash_short} - {message}")
-                result_text.append(f"     👤 {author} on {date}")
+    # Fields are separated by the ASCII unit separator, which can't appear in
+    # names or subjects, so a single bounded split per commit is enough
+    for parts in (line.split('\x1f', 3) for line in lines):
+        if len(parts) == 4:
+            hash_short, author, date, message = parts
+            result_text.append(f"  🔹 {hash_short} - {message}")
+            result_text.append(f"     👤 {author} on {date}")
     
     return "\n".join(result_text)
 
@@ -619,22 +978,28 @@ def dev_project_status(subpath: str = None) -> str:
     """
     result_parts = []
     
-    # Get file listing
-    try:
-        files_result = list_files(subpath or "")
-        if files_result.startswith("Error:"):
-            result_parts.append(f"📁 Files: {files_result}")
-        else:
-            files_data = json.loads(files_result)
-            file_count = len([f for f in files_data if f["type"] == "file"])
-            dir_count = len([f for f in files_data if f["type"] == "directory"])
+    # The directory scan and `git status` are independent; run them side by side
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        files_future = executor.submit(list_directory_entries, subpath or "")
+        git_future = executor.submit(git_status, subpath)
+        
+        # Get file listing; the entries come back as dicts, no JSON round trip
+        try:
+            files_data = files_future.result()
+            dir_count = 0
+            for f in files_data:
+                if f["type"] == "directory":
+                    dir_count += 1
+            file_count = len(files_data) - dir_count
             result_parts.append(f"📁 Project contains: {file_count} files, {dir_count} directories")
-    except:
-        result_parts.append("📁 Files: Unable to get file listing")
-    
-    # Get git status
-    git_result = git_status(subpath)
-    result_parts.append(git_result)
+        except ValueError as e:
+            result_parts.append(f"📁 Files: Error: {str(e)}")
+        except Exception as e:
+            result_parts.append(f"📁 Files: Error: Failed to list files: {str(e)}")
+        
+        # Get git status
+        git_result = git_future.result()
+        result_parts.append(git_result)
     
     return "\n\n".join(result_parts)
 
@@ -683,18 +1048,35 @@ def dev_create_project_structure(project_name: str, project_type: str = "python"
                 (f"{project_path}/.gitignore", ".env\n.DS_Store\nThumbs.db\n")
             ]
         
+        # Validate every target up front and create each parent directory once
+        targets = []
+        for file_path, content in files_to_create:
+            try:
+                targets.append((file_path, validate_path(file_path), content))
+            except ValueError:
+                continue
+        for directory in {os.path.dirname(full_path) for _, full_path, _ in targets}:
+            os.makedirs(directory, exist_ok=True)
+        
         # Create all files
         created_files = []
-        for file_path, content in files_to_create:
-            result = write_file(file_path, content)
-            if not result.startswith("Error:"):
-                created_files.append(file_path)
+        project_full_path = validate_path(project_path)
+        created_pathspecs = []
+        for file_path, full_path, content in targets:
+            try:
+                write_file_bytes(full_path, encode_text(content))
+            except OSError:
+                continue
+            created_files.append(file_path)
+            created_pathspecs.append(os.path.relpath(full_path, project_full_path))
         
         # Initialize git repository
         git_init_result = git_init(project_path)
         
-        # Create initial commit
-        commit_result = git_commit_all("Initial project setup", project_path)
+        # Create initial commit, staging just the files created above rather
+        # than having git scan the whole tree for `add .`
+        add_result = git_add_batch(created_pathspecs, project_path)
+        commit_result = commit_added_changes(add_result, "Initial project setup", project_path)
         
         result_text = [
             f"✅ Created {project_type} project: {project_name}",
@@ -745,10 +1127,42 @@ if __name__ == "__main__":
             except ValueError:
                 pass
                 
+        # Use uvloop + httptools when installed; fall back to uvicorn's defaults otherwise
+        try:
+            import uvloop
+            loop = "uvloop"
+        except ImportError:
+            loop = "auto"
+        try:
+            import httptools
+            http = "httptools"
+        except ImportError:
+            http = "auto"
+        
+        # Each SSE client holds a socket open; lift the soft fd limit toward the hard one
+        try:
+            import resource
+            soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+            wanted = 65535 if hard == resource.RLIM_INFINITY else min(65535, hard)
+            if soft != resource.RLIM_INFINITY and soft < wanted:
+                resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+        except (ImportError, ValueError, OSError):
+            pass  # Windows, or not permitted
+                
         print(f"Starting Web MCP Developer server on port {port}")
         print(f"Base directory: {BASE_DIR}")
-        uvicorn.run(app, host="127.0.0.1", port=port)
+        uvicorn.run(
+            app,
+            host="127.0.0.1",
+            port=port,
+            loop=loop,
+            http=http,
+            backlog=2048,
+            timeout_keep_alive=30,
+            access_log=False
+        )
     else:
-        # STDIO mode - for Claude Desktop
-        print(f"Starting STDIO MCP Developer server with base directory: {BASE_DIR}")
+        # STDIO mode - for Claude Desktop; stdout carries the protocol, so the
+        # banner goes to stderr (which the client keeps as the server log)
+        print(f"Starting STDIO MCP Developer server with base directory: {BASE_DIR}", file=sys.stderr)
         mcp.run(transport='stdio')
@@ -1,14 +1,26 @@
 from mcp.server.fastmcp import FastMCP
 import os
 import sys
-import datetime
 import json
 import platform
+import io
+import base64
+import codecs
+import re
+import functools
+import stat
+import time
+import threading
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 import shutil
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Determine base directory based on OS
 system = platform.system()
 if system == "Windows":
@@ -21,9 +33,48 @@ else:  # Linux or other
 # Create the base directory if it doesn't exist
 os.makedirs(BASE_DIR, exist_ok=True)
 
+# Normalized once so validate_path only normalizes the joined result
+BASE_DIR_NORM = os.path.normpath(BASE_DIR)
+
 # Create an MCP server
 mcp = FastMCP("FileSystem")
 
+# strftime format for every timestamp the tools report
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+# Files larger than this are read and decoded in chunks of this size
+READ_CHUNK_SIZE = 1 << 20
+
+# Match a path ending in ".env", and a ".env" path segment anywhere in a
+# normalized path. Windows and macOS file systems are case-insensitive by
+# default, so ".ENV" names the same file there and must be caught too.
+_ENV_RE_FLAGS = re.IGNORECASE if system in ("Windows", "Darwin") else 0
+_PATH_SEPS = re.escape(os.sep + (os.altsep or ''))
+ENV_FILE_RE = re.compile(r'\.env\Z', _ENV_RE_FLAGS)
+ENV_SEGMENT_RE = re.compile(rf'(?:^|[{_PATH_SEPS}])\.env(?:[{_PATH_SEPS}]|$)', _ENV_RE_FLAGS)
+
+@functools.lru_cache(maxsize=4096)
+def check_path(path):
+    """Normalize a path and apply validate_path's checks.
+    
+    Returns (full_path, None), or (None, message) when the path is rejected.
+    The result depends only on the path string, so it is memoized; rejections
+    are returned rather than raised so that they are cached too.
+    """
+    # Normalize the path
+    full_path = os.path.normpath(os.path.join(BASE_DIR_NORM, path))
+    
+    # Check if the path is a .env file or has .env extension (the basename
+    # ends with ".env" exactly when the normalized path does)
+    if ENV_FILE_RE.search(full_path):
+        return None, "Access denied: .env files are not accessible for security reasons"
+    
+    # Additional check for any path segment being .env
+    if ENV_SEGMENT_RE.search(full_path):
+        return None, "Access denied: Paths containing .env directories are not accessible"
+    
+    return full_path, None
+
 def validate_path(path):
     """
     Validate a file path and check security constraints.
@@ -33,21 +84,117 @@ def validate_path(path):
     2. Blocks access to any .env files
     3. Returns the full path
     """
-    # Normalize the path
-    full_path = os.path.normpath(os.path.join(BASE_DIR, path))
+    full_path, error = check_path(path)
+    if error:
+        raise ValueError(error)
+    return full_path
+
+def dumps_indented(data) -> str:
+    """Serialize data as 2-space indented JSON, via orjson when it's installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. undecodable file names (lone surrogates); json escapes those
+            pass
+    return json.dumps(data, indent=2)
+
+def format_timestamp(seconds: float) -> str:
+    """Format a stat timestamp as local time, without building a datetime"""
+    return time.strftime(TIMESTAMP_FORMAT, time.localtime(seconds))
+
+def stat_or_none(full_path: str):
+    """Return os.stat(full_path), or None where os.path.exists would be False"""
+    try:
+        return os.stat(full_path)
+    except (OSError, ValueError):
+        return None
+
+def read_file_bytes(full_path: str, size_hint: int) -> bytes:
+    """Read a whole file with os.read, sized from a prior stat.
     
-    # Check if the path is a .env file or has .env extension
-    if (os.path.basename(full_path) == '.env' or 
-        os.path.splitext(full_path)[1] == '.env' or
-        os.path.basename(full_path).endswith('.env')):
-        raise ValueError("Access denied: .env files are not accessible for security reasons")
+    Asking for one byte more than expected means the usual case (file
+    unchanged since the stat) is a single read that also signals EOF.
+    """
+    fd = os.open(full_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        data = os.read(fd, size_hint + 1)
+        if len(data) == size_hint:
+            return data
+        # The file changed size (or the read was short); read up to EOF
+        chunks = [data]
+        while data:
+            data = os.read(fd, 1 << 20)
+            chunks.append(data)
+        return b''.join(chunks)
+    finally:
+        os.close(fd)
+
+def encode_text(content: str) -> bytes:
+    """Encode text the way a text-mode write would (UTF-8, platform line endings)"""
+    if os.linesep != '\n':
+        content = content.replace('\n', os.linesep)
+    return content.encode('utf-8')
+
+def write_file_bytes(full_path: str, data: bytes):
+    """Atomically replace full_path with data; the parent directory must exist.
     
-    # Additional check for any path segment being .env
-    path_parts = os.path.normpath(path).split(os.sep)
-    if '.env' in path_parts:
-        raise ValueError("Access denied: Paths containing .env directories are not accessible")
+    The data goes to a sibling temp file that is fsynced and swapped in with
+    os.replace, so concurrent readers see either the old or the new content
+    and a crash mid-write never leaves a truncated file.
+    """
+    # Write through symlinks, as an in-place write would, instead of replacing the link
+    if os.path.islink(full_path):
+        full_path = os.path.realpath(full_path)
+    try:
+        mode = stat.S_IMODE(os.stat(full_path).st_mode)
+    except OSError:
+        mode = None
     
-    return full_path
+    tmp_path = f"{full_path}.tmp.{os.getpid()}.{threading.get_ident()}"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if mode is not None:
+            os.chmod(tmp_path, mode)  # keep the replaced file's permissions
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def read_text_file(full_path: str, size_hint: int) -> str:
+    """Read a UTF-8 file with universal newlines, as a text-mode read would.
+    
+    Small files are read in one go; larger ones are decoded and newline-
+    translated chunk by chunk in a single pass, rather than decoding the
+    whole buffer and then running two replace() passes over the result.
+    """
+    if size_hint <= READ_CHUNK_SIZE:
+        content = read_file_bytes(full_path, size_hint).decode('utf-8')
+        if '\r' in content:
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
+        return content
+    
+    decoder = io.IncrementalNewlineDecoder(codecs.getincrementaldecoder('utf-8')(), translate=True)
+    parts = []
+    fd = os.open(full_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+    try:
+        while True:
+            chunk = os.read(fd, READ_CHUNK_SIZE)
+            if not chunk:
+                parts.append(decoder.decode(b'', final=True))
+                break
+            parts.append(decoder.decode(chunk))
+    finally:
+        os.close(fd)
+    return ''.join(parts)
 
 @mcp.tool()
 def copy_file(source_path: str, destination_path: str) -> str:
@@ -62,24 +209,29 @@ def copy_file(source_path: str, destination_path: str) -> str:
         source_full_path = validate_path(source_path)
         destination_full_path = validate_path(destination_path)
         
-        # Check if the source file exists
-        if not os.path.exists(source_full_path):
+        # Check if the source file exists and is a file
+        source_stat = stat_or_none(source_full_path)
+        if source_stat is None:
             return f"Error: Source file '{source_path}' does not exist"
         
-        # Check if the source is a file
-        if not os.path.isfile(source_full_path):
+        if not stat.S_ISREG(source_stat.st_mode):
             return f"Error: Source '{source_path}' is not a file"
             
-        # Ensure the destination directory exists
+        # Ensure the destination directory exists (one stat when it already does)
         destination_dir = os.path.dirname(destination_full_path)
-        os.makedirs(destination_dir, exist_ok=True)
+        if stat_or_none(destination_dir) is None:
+            os.makedirs(destination_dir, exist_ok=True)
         
         # Check if destination already exists
-        if os.path.exists(destination_full_path):
+        if stat_or_none(destination_full_path) is not None:
             return f"Error: Destination '{destination_path}' already exists"
         
-        # Copy the file with metadata (timestamps, permissions)
-        shutil.copy2(source_full_path, destination_full_path)
+        # Copy the data through copyfile's kernel fast path (sendfile/fcopyfile/
+        # CopyFile2), then apply the source's permissions and timestamps from
+        # the stat above instead of copy2's copystat (re-stat, xattrs, flags)
+        shutil.copyfile(source_full_path, destination_full_path)
+        os.chmod(destination_full_path, stat.S_IMODE(source_stat.st_mode))
+        os.utime(destination_full_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
         
         return f"File copied successfully from '{source_path}' to '{destination_path}'"
         
@@ -99,35 +251,37 @@ def list_files(directory: str = "") -> str:
         # Validate and get the full path
         full_path = validate_path(directory)
         
-        # Check if the directory exists
-        if not os.path.exists(full_path):
+        # Check if the directory exists and is a directory
+        dir_stat = stat_or_none(full_path)
+        if dir_stat is None:
             return f"Error: Directory '{directory}' does not exist"
         
-        # Check if it's a directory
-        if not os.path.isdir(full_path):
+        if not stat.S_ISDIR(dir_stat.st_mode):
             return f"Error: '{directory}' is not a directory"
         
-        # Get the list of files and directories
-        items = os.listdir(full_path)
-        
-        # Build the result
+        # Build the result from one scandir pass; a single stat per entry
+        # supplies the type, size and modification time
         result = []
-        for item in items:
-            item_path = os.path.join(full_path, item)
-            item_type = "directory" if os.path.isdir(item_path) else "file"
-            item_size = os.path.getsize(item_path) if os.path.isfile(item_path) else 0
-            item_modified = datetime.datetime.fromtimestamp(
-                os.path.getmtime(item_path)
-            ).strftime("%Y-%m-%d %H:%M:%S")
-            
-            result.append({
-                "name": item,
-                "type": item_type,
-                "size": item_size,
-                "modified": item_modified
-            })
+        # Files written together share mtimes, so format each distinct second once
+        formatted_mtimes = {}
+        with os.scandir(full_path) as entries:
+            for entry in entries:
+                entry_stat = entry.stat()
+                item_type = "directory" if stat.S_ISDIR(entry_stat.st_mode) else "file"
+                item_size = entry_stat.st_size if stat.S_ISREG(entry_stat.st_mode) else 0
+                mtime = entry_stat.st_mtime_ns // 1_000_000_000
+                item_modified = formatted_mtimes.get(mtime)
+                if item_modified is None:
+                    item_modified = formatted_mtimes[mtime] = format_timestamp(mtime)
+                
+                result.append({
+                    "name": entry.name,
+                    "type": item_type,
+                    "size": item_size,
+                    "modified": item_modified
+                })
         
-        return json.dumps(result, indent=2)
+        return dumps_indented(result)
         
     except ValueError as e:
         return f"Error: {str(e)}"
@@ -145,19 +299,16 @@ def read_file(path: str) -> str:
         # Validate and get the full path
         full_path = validate_path(path)
         
-        # Check if the file exists
-        if not os.path.exists(full_path):
+        # Check that the file exists and is a regular file (one stat for both)
+        file_stat = stat_or_none(full_path)
+        if file_stat is None:
             return f"Error: File '{path}' does not exist"
         
-        # Check if it's a file
-        if not os.path.isfile(full_path):
+        if not stat.S_ISREG(file_stat.st_mode):
             return f"Error: '{path}' is not a file"
         
-        # Read the file content
-        with open(full_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        return content
+        # Read the file content, translating \r\n and \r to \n like text mode
+        return read_text_file(full_path, file_stat.st_size)
         
     except ValueError as e:
         return f"Error: {str(e)}"
@@ -166,6 +317,35 @@ def read_file(path: str) -> str:
     except Exception as e:
         return f"Error: Failed to read file: {str(e)}"
 
+@mcp.tool()
+def read_file_b64(path: str) -> str:
+    """Read the raw contents of a file, base64-encoded.
+    
+    Use this for binary files; the bytes are returned as-is, with no text
+    decoding or newline translation.
+    
+    Args:
+        path: The file path relative to the base directory
+    """
+    try:
+        # Validate and get the full path
+        full_path = validate_path(path)
+        
+        # Check that the file exists and is a regular file (one stat for both)
+        file_stat = stat_or_none(full_path)
+        if file_stat is None:
+            return f"Error: File '{path}' does not exist"
+        
+        if not stat.S_ISREG(file_stat.st_mode):
+            return f"Error: '{path}' is not a file"
+        
+        return base64.b64encode(read_file_bytes(full_path, file_stat.st_size)).decode('ascii')
+        
+    except ValueError as e:
+        return f"Error: {str(e)}"
+    except Exception as e:
+        return f"Error: Failed to read file: {str(e)}"
+
 @mcp.tool()
 def write_file(path: str, content: str) -> str:
     """Create or overwrite a file with the given content.
@@ -182,9 +362,9 @@ def write_file(path: str, content: str) -> str:
         directory = os.path.dirname(full_path)
         os.makedirs(directory, exist_ok=True)
         
-        # Write the content to the file
-        with open(full_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        # Write the content to the file, encoded once and handed to os.write
+        # whole rather than through TextIOWrapper's 8 KiB buffer
+        write_file_bytes(full_path, encode_text(content))
         
         return f"File '{path}' has been written successfully"
         
@@ -205,21 +385,23 @@ def delete_file(path: str) -> str:
         # Validate and get the full path
         full_path = validate_path(path)
         
-        # Check if the file exists
-        if not os.path.exists(full_path):
-            return f"Error: File '{path}' does not exist"
-        
-        # Check if it's a file
-        if not os.path.isfile(full_path):
-            return f"Error: '{path}' is not a file"
-        
-        # Delete the file
+        # Delete the file; a missing path or a directory shows up as the
+        # error, so the success path needs no separate stat
         os.remove(full_path)
         
         return f"File '{path}' has been deleted successfully"
         
     except ValueError as e:
         return f"Error: {str(e)}"
+    except (FileNotFoundError, NotADirectoryError):
+        return f"Error: File '{path}' does not exist"
+    except IsADirectoryError:
+        return f"Error: '{path}' is not a file"
+    except PermissionError as e:
+        # Windows and macOS report unlinking a directory as a permission error
+        if os.path.isdir(full_path):
+            return f"Error: '{path}' is not a file"
+        return f"Error: Failed to delete file: {str(e)}"
     except Exception as e:
         return f"Error: Failed to delete file: {str(e)}"
 
@@ -234,16 +416,16 @@ def create_directory(path: str) -> str:
         # Validate and get the full path
         full_path = validate_path(path)
         
-        # Check if the directory already exists
-        if os.path.exists(full_path):
-            if os.path.isdir(full_path):
+        # Create the directory; only an existing path needs a stat to say what it is
+        try:
+            os.makedirs(full_path)
+        except FileExistsError:
+            existing_stat = stat_or_none(full_path)
+            if existing_stat is not None and stat.S_ISDIR(existing_stat.st_mode):
                 return f"Directory '{path}' already exists"
             else:
                 return f"Error: '{path}' already exists as a file"
         
-        # Create the directory
-        os.makedirs(full_path, exist_ok=True)
-        
         return f"Directory '{path}' has been created successfully"
         
     except ValueError as e:
@@ -263,16 +445,14 @@ def delete_directory(path: str, recursive: bool = False) -> str:
         # Validate and get the full path
         full_path = validate_path(path)
         
-        # Check if the directory exists
-        if not os.path.exists(full_path):
-            return f"Error: Directory '{path}' does not exist"
-        
-        # Check if it's a directory
-        if not os.path.isdir(full_path):
-            return f"Error: '{path}' is not a directory"
-        
-        # Delete the directory
+        # Delete the directory. rmdir reports a missing path or a file itself;
+        # rmtree would open a non-directory (and block on a FIFO), so check first
         if recursive:
+            dir_stat = stat_or_none(full_path)
+            if dir_stat is None:
+                return f"Error: Directory '{path}' does not exist"
+            if not stat.S_ISDIR(dir_stat.st_mode):
+                return f"Error: '{path}' is not a directory"
             shutil.rmtree(full_path)
         else:
             os.rmdir(full_path)
@@ -281,6 +461,12 @@ def delete_directory(path: str, recursive: bool = False) -> str:
         
     except ValueError as e:
         return f"Error: {str(e)}"
+    except FileNotFoundError:
+        return f"Error: Directory '{path}' does not exist"
+    except NotADirectoryError:
+        if stat_or_none(full_path) is None:
+            return f"Error: Directory '{path}' does not exist"
+        return f"Error: '{path}' is not a directory"
     except OSError as e:
         if "not empty" in str(e):
             return f"Error: Directory '{path}' is not empty. Use recursive=True to delete non-empty directories."
@@ -299,29 +485,24 @@ def file_info(path: str) -> str:
         # Validate and get the full path
         full_path = validate_path(path)
         
-        # Check if the path exists
-        if not os.path.exists(full_path):
+        # Check if the path exists; this one stat supplies everything below
+        st = stat_or_none(full_path)
+        if st is None:
             return f"Error: '{path}' does not exist"
         
         # Get file/directory information
         info = {
             "name": os.path.basename(full_path),
             "path": path,
-            "type": "directory" if os.path.isdir(full_path) else "file",
-            "exists": os.path.exists(full_path),
-            "size": os.path.getsize(full_path) if os.path.isfile(full_path) else None,
-            "created": datetime.datetime.fromtimestamp(
-                os.path.getctime(full_path)
-            ).strftime("%Y-%m-%d %H:%M:%S"),
-            "modified": datetime.datetime.fromtimestamp(
-                os.path.getmtime(full_path)
-            ).strftime("%Y-%m-%d %H:%M:%S"),
-            "accessed": datetime.datetime.fromtimestamp(
-                os.path.getatime(full_path)
-            ).strftime("%Y-%m-%d %H:%M:%S"),
+            "type": "directory" if stat.S_ISDIR(st.st_mode) else "file",
+            "exists": True,
+            "size": st.st_size if stat.S_ISREG(st.st_mode) else None,
+            "created": format_timestamp(st.st_ctime),
+            "modified": format_timestamp(st.st_mtime),
+            "accessed": format_timestamp(st.st_atime),
         }
         
-        return json.dumps(info, indent=2)
+        return dumps_indented(info)
         
     except ValueError as e:
         return f"Error: {str(e)}"
@@ -2,6 +2,8 @@ from mcp.server.fastmcp import FastMCP
 import subprocess
 import os
 import re
+import shutil
+import tempfile
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
@@ -10,9 +12,37 @@ import sys
 # Set the fixed Git repository path - locked to your specified repo
 GIT_REPO_PATH = r"C:/Users/Administrator/Desktop/TestField"
 
+# Absolute repository path and its separator-terminated prefix, resolved once
+# so the traversal check is a plain startswith
+GIT_REPO_ABS = os.path.abspath(GIT_REPO_PATH)
+GIT_REPO_PREFIX = os.path.join(GIT_REPO_ABS, "")
+
+# Absolute path to git, resolved once; an absolute executable (with no cwd and
+# close_fds=False) lets subprocess launch git via posix_spawn instead of fork+exec
+GIT_EXECUTABLE = shutil.which("git") or "git"
+
+# Environment overrides for every git call:
+# - GIT_OPTIONAL_LOCKS=0 (same as --no-optional-locks) stops status/diff/etc.
+#   from opportunistically rewriting the index, so read-only calls do no disk
+#   writes and don't contend for index.lock
+# - GIT_TERMINAL_PROMPT=0 makes pull/push fail fast instead of waiting on a
+#   credential prompt nobody can answer
+GIT_ENV_OVERRIDES = {"GIT_OPTIONAL_LOCKS": "0", "GIT_TERMINAL_PROMPT": "0"}
+
 # Create an MCP server
 mcp = FastMCP("GitTools")
 
+# Shell metacharacters rejected in tool arguments, compiled once at import
+UNSAFE_ARG_RE = re.compile(r'[;&|]')
+UNSAFE_COMMAND_RE = re.compile(r'[;&|`$]')
+
+# Whitelist of git commands git_execute may run
+ALLOWED_GIT_COMMANDS = frozenset({
+    'version', 'status', 'log', 'add', 'commit', 'branch', 
+    'checkout', 'init', 'diff', 'show', 'remote', 'fetch', 
+    'config', 'tag', 'ls-files', 'pull', 'push'
+})
+
 def run_git_command(command, args=None, subpath=None):
     """Run a git command with specified arguments in a specific subfolder.
     
@@ -21,56 +51,69 @@ def run_git_command(command, args=None, subpath=None):
         args: Command arguments
         subpath: Optional subfolder path relative to repository root
     """
-    # Start with the base git command
-    cmd = ["git"]
-    
-    # Add the specific command
-    cmd.append(command)
-    
-    # Add any arguments that were passed
-    if args:
-        if isinstance(args, list):
-            cmd.extend(args)
-        else:
-            cmd.append(args)
-    
     try:
         # Determine working directory
-        working_dir = GIT_REPO_PATH
+        working_dir = GIT_REPO_ABS
         
         if subpath:
-            # Normalize the path to prevent directory traversal
-            norm_path = os.path.normpath(subpath)
+            # Normalize the path to prevent directory traversal; only paths
+            # with a '..' segment need normpath, plain names are used as-is
+            norm_path = subpath.replace('\\', '/')
+            if '..' in norm_path.split('/'):
+                norm_path = os.path.normpath(norm_path)
             
             # Prevent escaping the repository with path traversal
             if norm_path.startswith('..') or norm_path.startswith('/') or norm_path.startswith('\\'):
                 return f"Error: Invalid path. Must be relative to repository root: {norm_path}"
                 
             # Create full path by joining repository path with subfolder
-            working_dir = os.path.join(GIT_REPO_PATH, norm_path)
+            working_dir = os.path.join(GIT_REPO_ABS, norm_path)
+            
+            # Final check to ensure we're still within the repository
+            # (catches drive-qualified paths, which join() lets replace the root)
+            if not working_dir.startswith(GIT_REPO_PREFIX):
+                return f"Error: Path is outside the repository: {norm_path}"
             
             # Ensure the path exists
             if not os.path.exists(working_dir):
                 return f"Error: Path does not exist: {norm_path}"
-            
-            # Final check to ensure we're still within the repository
-            if not os.path.abspath(working_dir).startswith(os.path.abspath(GIT_REPO_PATH)):
-                return f"Error: Path is outside the repository: {norm_path}"
         
-        # Run the command in the specified directory
-        result = subprocess.run(
-            cmd, 
-            cwd=working_dir, 
-            text=True, 
-            capture_output=True, 
-            check=False  # Don't raise exception on non-zero exit
-        )
+        # Start with the base git command; -C replaces cwd= so the posix_spawn
+        # fast path applies
+        cmd = [GIT_EXECUTABLE, "-C", working_dir]
         
-        # Return both stdout and stderr
-        if result.returncode == 0:
-            return result.stdout.strip()
-        else:
-            return f"Error (code {result.returncode}): {result.stderr.strip()}"
+        # Add the specific command
+        cmd.append(command)
+        
+        # Add any arguments that were passed
+        if args:
+            if isinstance(args, list):
+                cmd.extend(args)
+            else:
+                cmd.append(args)
+        
+        # Run the command in the specified directory. stdout goes to an
+        # unlinked temp file that is read back in one call, instead of being
+        # pumped through a 64 KiB pipe by communicate()'s selector loop;
+        # stderr is small and stays a pipe
+        # (text mode, so it decodes like text=True: locale encoding, universal newlines)
+        with tempfile.TemporaryFile('w+') as stdout_file:
+            proc = subprocess.Popen(
+                cmd,
+                stdout=stdout_file,
+                stderr=subprocess.PIPE,
+                text=True,
+                close_fds=False,  # No fds to hide from git; skips the close-all-fds pass
+                env={**os.environ, **GIT_ENV_OVERRIDES}
+            )
+            _, stderr = proc.communicate()
+            
+            # Return both stdout and stderr
+            if proc.returncode != 0:
+                return f"Error (code {proc.returncode}): {stderr.strip()}"
+            
+            stdout_file.seek(0)
+            return stdout_file.read().strip()
     except Exception as e:
         return f"Failed to execute command: {str(e)}"
 
@@ -107,7 +150,7 @@ def git_add(files: str, subpath: str = None) -> str:
         subpath: Optional subfolder path relative to repository root
     """
     # Basic sanitization to prevent command injection
-    if re.search(r'[;&|]', files):
+    if UNSAFE_ARG_RE.search(files):
         return "Error: Invalid file pattern"
     return run_git_command("add", files, subpath=subpath)
 
@@ -141,7 +184,7 @@ def git_checkout(branch_or_file: str, subpath: str = None) -> str:
         subpath: Optional subfolder path relative to repository root
     """
     # Basic sanitization to prevent command injection
-    if re.search(r'[;&|]', branch_or_file):
+    if UNSAFE_ARG_RE.search(branch_or_file):
         return "Error: Invalid branch or file name"
     return run_git_command("checkout", branch_or_file, subpath=subpath)
 
@@ -174,7 +217,7 @@ def git_pull(remote: str = "origin", branch: str = "main", subpath: str = None)
         subpath: Optional subfolder path relative to repository root
     """
     # Basic sanitization
-    if re.search(r'[;&|]', remote) or re.search(r'[;&|]', branch):
+    if UNSAFE_ARG_RE.search(remote) or UNSAFE_ARG_RE.search(branch):
         return "Error: Invalid remote or branch name"
     return run_git_command("pull", [remote, branch], subpath=subpath)
 
@@ -188,7 +231,7 @@ def git_push(remote: str = "origin", branch: str = "main", subpath: str = None)
         subpath: Optional subfolder path relative to repository root
     """
     # Basic sanitization
-    if re.search(r'[;&|]', remote) or re.search(r'[;&|]', branch):
+    if UNSAFE_ARG_RE.search(remote) or UNSAFE_ARG_RE.search(branch):
         return "Error: Invalid remote or branch name"
     return run_git_command("push", [remote, branch], subpath=subpath)
 
@@ -201,7 +244,7 @@ def git_execute(command: str, subpath: str = None) -> str:
         subpath: Optional subfolder path relative to repository root
     """
     # Sanitization for the general command
-    if re.search(r'[;&|`$]', command) or '..' in command:
+    if UNSAFE_COMMAND_RE.search(command) or '..' in command:
         return "Error: Potentially unsafe command detected"
     
     parts = command.split()
@@ -211,14 +254,7 @@ def git_execute(command: str, subpath: str = None) -> str:
     git_cmd = parts[0]
     args = parts[1:] if len(parts) > 1 else []
     
-    # Whitelist of allowed git commands
-    allowed_commands = [
-        'version', 'status', 'log', 'add', 'commit', 'branch', 
-        'checkout', 'init', 'diff', 'show', 'remote', 'fetch', 
-        'config', 'tag', 'ls-files', 'pull', 'push'
-    ]
-    
-    if git_cmd not in allowed_commands:
+    if git_cmd not in ALLOWED_GIT_COMMANDS:
         return f"Error: Command '{git_cmd}' is not allowed"
     
     return run_git_command(git_cmd, args, subpath=subpath)
@@ -227,12 +263,26 @@ def git_execute(command: str, subpath: str = None) -> str:
 def list_subfolders() -> str:
     """List all subfolders in the Git repository."""
     try:
+        # Iterative walk over os.scandir, one pass per directory; entries carry
+        # their type from readdir and paths are built relative as we go, so
+        # there are no relpath calls. Output order matches a top-down os.walk
         result = []
-        for root, dirs, files in os.walk(GIT_REPO_PATH):
-            # Get relative path from the repository root
-            rel_path = os.path.relpath(root, GIT_REPO_PATH)
-            if rel_path != '.':  # Skip the repository root
+        stack = [(GIT_REPO_ABS, '')]
+        while stack:
+            dir_path, rel_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    # Don't descend into git metadata (thousands of object
+                    # directories); symlinked directories are skipped, as os.walk does
+                    subdirs = [entry for entry in entries
+                               if entry.name != '.git' and entry.is_dir(follow_symlinks=False)]
+            except OSError:
+                continue  # Unreadable directory; os.walk skips these too
+            
+            if rel_path:  # Skip the repository root
                 result.append(rel_path)
+            prefix = rel_path + os.sep if rel_path else ''
+            stack.extend((entry.path, prefix + entry.name) for entry in reversed(subdirs))
         
         return '\n'.join(result) if result else "No subfolders found."
     except Exception as e:
@@ -1,22 +1,29 @@
 from mcp.server.fastmcp import FastMCP, Context
 import os
 import json
-import datetime
 import re
 import base64
+import asyncio
+import collections
+import itertools
+import functools
+import importlib.util
+from urllib.parse import quote, unquote
 from starlette.applications import Starlette
+from starlette.middleware import Middleware
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 import sys
 from typing import List, Dict, Any, Optional
-from github import Github, GithubException
-from github.Repository import Repository
-from github.Issue import Issue
-from github.PullRequest import PullRequest
-from github.ContentFile import ContentFile
+import httpx
 from dotenv import load_dotenv
 import time
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -25,92 +32,524 @@ GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
 if not GITHUB_TOKEN:
     print("Warning: GITHUB_TOKEN not found in environment variables. Some functionality will be limited.")
 
-# Initialize GitHub API client
+# Optional comma-separated list of tokens (GITHUB_TOKENS=tok1,tok2,...);
+# requests rotate across them round-robin, each token with its own rate
+# limits. They should all belong to the same account, since bare "repo"
+# names resolve against whichever token serves the /user lookup
+GITHUB_TOKENS = [token.strip() for token in os.getenv("GITHUB_TOKENS", "").split(",") if token.strip()]
+if not GITHUB_TOKENS and GITHUB_TOKEN:
+    GITHUB_TOKENS = [GITHUB_TOKEN]
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_HEADERS = {
+    "Accept": "application/vnd.github+json",
+    "X-GitHub-Api-Version": "2022-11-28",
+}
+
+# HTTP/2 (concurrent requests multiplexed over one connection) needs the
+# optional h2 package; without it httpx speaks HTTP/1.1 over the pool
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Media type for file contents as raw bytes rather than base64 in JSON
+RAW_MEDIA_TYPE = "application/vnd.github.raw"
+
+# Largest file the content tools will display (1MB)
+MAX_FILE_SIZE = 1000000
+
+# Longest we sleep for a rate limit to reset before sending a request
+# anyway (and letting GitHub's error through)
+RATE_LIMIT_MAX_WAIT = 60.0
+
+class GitHubAPIError(Exception):
+    """An error response (4xx/5xx) from the GitHub API"""
+    def __init__(self, status: int, data: Any):
+        self.status = status
+        self.data = data if isinstance(data, dict) else {}
+        super().__init__(self.data.get("message", f"HTTP {status}"))
+
+class RateLimiter:
+    """Allows at most `rate` acquisitions in any `period` seconds; acquire() waits for a slot"""
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.times = collections.deque()
+        self.lock = asyncio.Lock()
+        
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                while self.times and now - self.times[0] >= self.period:
+                    self.times.popleft()
+                if len(self.times) < self.rate:
+                    self.times.append(now)
+                    return
+                await asyncio.sleep(self.period - (now - self.times[0]))
+
+class GitHubClient:
+    """An API client for one token, with client-side limits matching that token's quotas"""
+    def __init__(self, token: str):
+        # One async client per token for the whole process: tools run
+        # concurrently on the event loop instead of blocking it, and share a
+        # pool of kept-alive connections
+        self.http = httpx.AsyncClient(
+            base_url=GITHUB_API_URL,
+            headers={**GITHUB_HEADERS, "Authorization": f"Bearer {token}"},
+            timeout=15.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=20, keepalive_expiry=30)
+        )
+        # Primary quotas per API resource, plus the secondary limit GitHub
+        # puts on content-creating requests
+        self.limiters = {
+            "core": RateLimiter(5000, 3600),
+            "search": RateLimiter(30, 60),
+            "graphql": RateLimiter(5000, 3600),
+        }
+        self.write_limiter = RateLimiter(80, 60)
+        # Wall-clock time at which an exhausted quota resets, per resource
+        self.reset_at: Dict[str, float] = {}
+        
+    async def send(self, request: httpx.Request, stream: bool = False) -> httpx.Response:
+        """Send a request within the rate limits, retrying once after a rate-limit error"""
+        path = request.url.path
+        resource = "search" if path.startswith("/search/") else "graphql" if path == "/graphql" else "core"
+        
+        for attempt in range(2):
+            # Wait out a quota that an earlier response reported as used up
+            wait = self.reset_at.get(resource, 0) - time.time()
+            if 0 < wait <= RATE_LIMIT_MAX_WAIT:
+                await asyncio.sleep(wait)
+            await self.limiters[resource].acquire()
+            if request.method != "GET" and resource != "graphql":
+                await self.write_limiter.acquire()
+                
+            response = await self.http.send(request, stream=stream)
+            
+            if response.headers.get("X-RateLimit-Remaining") == "0":
+                self.reset_at[resource] = float(response.headers.get("X-RateLimit-Reset", 0))
+            if response.status_code in (403, 429) and attempt == 0:
+                # Secondary limits send Retry-After; an exhausted primary quota
+                # is a 403 with no requests remaining
+                if "Retry-After" in response.headers:
+                    delay = float(response.headers["Retry-After"])
+                elif response.headers.get("X-RateLimit-Remaining") == "0":
+                    delay = self.reset_at[resource] - time.time()
+                else:
+                    return response
+                if delay <= RATE_LIMIT_MAX_WAIT:
+                    await response.aclose()
+                    await asyncio.sleep(max(delay, 0))
+                    continue
+            return response
+        return response
+
+# Login of the authenticated user, which bare "repo" names resolve against;
+# looked up once, when the connection is tested
+GITHUB_LOGIN = None
+
+# Initialize GitHub API clients
 try:
-    g = Github(GITHUB_TOKEN)
+    if not GITHUB_TOKENS:
+        raise ValueError("no token configured")
     # Test the connection by getting the authenticated user
-    user = g.get_user()
-    print(f"Connected to GitHub as: {user.login}")
+    response = httpx.get(
+        f"{GITHUB_API_URL}/user",
+        headers={**GITHUB_HEADERS, "Authorization": f"Bearer {GITHUB_TOKENS[0]}"},
+        timeout=15.0
+    )
+    if response.status_code != 200:
+        raise GitHubAPIError(response.status_code, response.json())
+    GITHUB_LOGIN = response.json()["login"]
+    print(f"Connected to GitHub as: {GITHUB_LOGIN}")
+    
+    clients = [GitHubClient(token) for token in GITHUB_TOKENS]
 except Exception as e:
     print(f"Error initializing GitHub client: {str(e)}")
-    # Initialize with a None value that we'll check before operations
-    g = None
+    # Initialize with no clients, which we'll check before operations
+    clients = []
+
+# Round-robin over the clients (one per token)
+next_client = itertools.cycle(clients).__next__
 
 # Create an MCP server
 mcp = FastMCP("GitHubTools")
 
+class TTLCache:
+    """Small in-process cache whose entries expire ttl seconds after being stored"""
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries: Dict[Any, tuple] = {}
+        
+    def get(self, key) -> Any:
+        """Return the cached value, or None if it is missing or expired"""
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() >= entry[0]:
+            del self.entries[key]
+            return None
+        return entry[1]
+        
+    def set(self, key, value):
+        self.entries.pop(key, None)
+        if len(self.entries) >= self.maxsize:
+            # Evict the oldest entry (dicts keep insertion order)
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        
+    def pop(self, key):
+        self.entries.pop(key, None)
+
+# Responses of the read-only tools and resources, with TTLs matched to how
+# often each kind of data changes. Only successful responses are cached
+REPO_CACHE = TTLCache(maxsize=1024, ttl=300)
+BRANCHES_CACHE = TTLCache(maxsize=1024, ttl=60)
+README_CACHE = TTLCache(maxsize=256, ttl=600)
+FILE_CACHE = TTLCache(maxsize=64, ttl=60)  # Entries can be up to 1MB each
+
+# Last 200 response of each GET that carried an ETag, keyed by (URL, Accept).
+# Entries are revalidated with If-None-Match on every use, so the TTL only
+# bounds how long an unused response is kept in memory
+ETAG_CACHE = TTLCache(maxsize=256, ttl=3600)
+
+# GraphQL queries for the list tools: one round trip returns each issue or
+# pull request together with its author, labels, assignees and mergeability,
+# and repository.issues never includes pull requests
+ISSUES_QUERY = """
+query($owner: String!, $name: String!, $count: Int!, $cursor: String, $states: [IssueState!]) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $count, after: $cursor, states: $states, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title state createdAt updatedAt closedAt body url
+        author { login }
+        labels(first: 100) { nodes { name } }
+        assignees(first: 100) { nodes { login } }
+        comments { totalCount }
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $count: Int!, $cursor: String, $states: [PullRequestState!]) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $count, after: $cursor, states: $states, orderBy: {field: CREATED_AT, direction: DESC}) {
+      nodes {
+        number title state createdAt updatedAt closedAt mergedAt body url
+        author { login }
+        headRefName baseRefName mergeable isDraft
+      }
+      pageInfo { hasNextPage endCursor }
+    }
+  }
+}
+"""
+
+# Object id (blob SHA) of a path at a revision, without the file's content
+FILE_SHA_QUERY = """
+query($owner: String!, $name: String!, $expression: String!) {
+  repository(owner: $owner, name: $name) {
+    object(expression: $expression) { __typename oid }
+  }
+}
+"""
+
+# REST state filters as GraphQL state lists (None means every state)
+ISSUE_STATES = {"open": ["OPEN"], "closed": ["CLOSED"], "all": None}
+PULL_REQUEST_STATES = {"open": ["OPEN"], "closed": ["CLOSED", "MERGED"], "all": None}
+
+# GraphQL MergeableState values as REST's mergeable flag
+MERGEABLE_STATES = {"MERGEABLE": True, "CONFLICTING": False, "UNKNOWN": None}
+
 # --- Helper functions ---
 
-def get_repo(repo_name: str) -> Repository:
+# Running calls of @single_flight functions, keyed by function and arguments
+IN_FLIGHT: Dict[Any, asyncio.Task] = {}
+
+def single_flight(func):
+    """
+    Share one in-progress call among concurrent identical calls of an async function.
+    
+    A burst of the same read-only tool call (common when a model fires tool
+    calls in parallel) then makes one set of API requests rather than one
+    per call, before there is anything in the caches to hit.
     """
-    Get a repository by name.
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        try:
+            task = IN_FLIGHT.get(key)
+        except TypeError:
+            # Unhashable arguments; just run the call
+            return await func(*args, **kwargs)
+        if task is None:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            IN_FLIGHT[key] = task
+            task.add_done_callback(lambda _: IN_FLIGHT.pop(key, None))
+        # Shielded, so one caller going away doesn't cancel the call for the others
+        return await asyncio.shield(task)
+    return wrapper
+
+def dumps_indented(data) -> str:
+    """Serialize data as 2-space indented JSON, via orjson when it's installed"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            # e.g. lone surrogates from \ud800-style escapes; json escapes those
+            pass
+    return json.dumps(data, indent=2)
+
+def raise_for_github_error(response: httpx.Response):
+    """Raise GitHubAPIError if a (read) response is an error response"""
+    if response.status_code >= 400:
+        try:
+            data = response.json()
+        except ValueError:
+            data = {"message": response.text}
+        raise GitHubAPIError(response.status_code, data)
+
+async def github_send(method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request to the GitHub API, raising GitHubAPIError for error responses.
+    
+    GETs are sent as conditional requests when an earlier response carried an
+    ETag; a 304 Not Modified (which doesn't count against the rate limit)
+    returns that earlier response.
+    """
+    github = next_client()
+    request = github.http.build_request(method, url, **kwargs)
+    cache_key = cached = None
+    if method == "GET":
+        cache_key = (str(request.url), request.headers.get("Accept"))
+        cached = ETAG_CACHE.get(cache_key)
+        if cached is not None:
+            request.headers["If-None-Match"] = cached.headers["ETag"]
+            
+    response = await github.send(request)
+    if response.status_code == 304 and cached is not None:
+        return cached
+    raise_for_github_error(response)
+    if cache_key is not None and "ETag" in response.headers:
+        ETAG_CACHE.set(cache_key, response)
+    return response
+
+async def github_request(method: str, url: str, **kwargs) -> Any:
+    """Send a request to the GitHub API and return the decoded JSON body"""
+    response = await github_send(method, url, **kwargs)
+    return response.json() if response.content else None
+
+async def github_paginate(url: str, max_count: int, params: Optional[Dict[str, Any]] = None, items_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Collect up to max_count items from a paginated list endpoint.
+    
+    Follows the Link: rel="next" header until enough items have been read.
+    items_key names the list inside the body for endpoints (like search)
+    that wrap it in an object.
+    """
+    # Size pages to the request (the API default is 30, the maximum 100), so
+    # small max_counts take a single, small page
+    params = {**(params or {}), "per_page": min(max_count, 100)}
+    items = []
+    while url and len(items) < max_count:
+        response = await github_send("GET", url, params=params)
+        page = response.json()
+        items.extend(page[items_key] if items_key else page)
+        url = response.links.get("next", {}).get("url")
+        params = None  # The next link already carries the query string
+    return items[:max_count]
+
+async def github_graphql(query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a GraphQL query against the GitHub API and return its data"""
+    result = await github_request("POST", "/graphql", json={"query": query, "variables": variables})
+    if result.get("errors"):
+        # GraphQL reports errors in a 200 response; surface them like REST errors
+        error = result["errors"][0]
+        status = 404 if error.get("type") == "NOT_FOUND" else 400
+        raise GitHubAPIError(status, {"message": error.get("message", "GraphQL query failed")})
+    return result["data"]
+
+async def github_graphql_nodes(query: str, connection: str, variables: Dict[str, Any], max_count: int) -> List[Dict[str, Any]]:
+    """
+    Collect up to max_count nodes of a repository connection (e.g. "issues").
+    
+    The query takes $count and $cursor and selects the connection's nodes and
+    pageInfo; GraphQL allows at most 100 nodes per query.
+    """
+    nodes = []
+    cursor = None
+    while len(nodes) < max_count:
+        data = await github_graphql(query, {**variables, "count": min(max_count - len(nodes), 100), "cursor": cursor})
+        page = data["repository"][connection]
+        nodes.extend(page["nodes"])
+        if not page["pageInfo"]["hasNextPage"]:
+            break
+        cursor = page["pageInfo"]["endCursor"]
+    return nodes
+
+async def get_repo_full_name(repo_name: str) -> str:
+    """
+    Get the "owner/repo" name of a repository.
     Handles both format: "owner/repo" and just "repo" for the authenticated user's repos
     """
+    global GITHUB_LOGIN
     if "/" not in repo_name:
         # If only repo name is provided, assume it's the authenticated user's repo
-        return g.get_user().get_repo(repo_name)
+        if GITHUB_LOGIN is None:
+            user = await github_request("GET", "/user")
+            GITHUB_LOGIN = user["login"]
+        return f"{GITHUB_LOGIN}/{repo_name}"
     else:
         # Otherwise, it's in the format "owner/repo"
-        return g.get_repo(repo_name)
+        return repo_name
+
+async def get_repo_path(repo_name: str) -> str:
+    """Get the API path of a repository by name ("owner/repo" or just "repo")"""
+    return f"/repos/{await get_repo_full_name(repo_name)}"
+
+async def get_repo(repo_name: str) -> Dict[str, Any]:
+    """Get a repository's metadata by name ("owner/repo" or just "repo")"""
+    return await github_request("GET", await get_repo_path(repo_name))
+
+async def get_contents(repo_path: str, path: str, branch: str = None) -> Any:
+    """Get a file (dict) or directory listing (list) from the contents API"""
+    params = {"ref": branch} if branch else None
+    return await github_request("GET", f"{repo_path}/contents/{quote(path)}", params=params)
+
+async def get_raw_file(repo_path: str, path: str, branch: str = None) -> Any:
+    """
+    Get a file's bytes from the contents API in the raw media type, which
+    skips GitHub's base64 encoding (and decoding it here).
+    
+    Returns the bytes; the size (an int) of a file over MAX_FILE_SIZE, whose
+    body isn't downloaded when the size is known up front; or, for a
+    directory, its listing.
+    """
+    github = next_client()
+    request = github.http.build_request(
+        "GET", f"{repo_path}/contents/{quote(path)}",
+        params={"ref": branch} if branch else None,
+        headers={"Accept": RAW_MEDIA_TYPE}
+    )
+    response = await github.send(request, stream=True)
+    try:
+        # Content-Length is the compressed size when the body is encoded
+        if response.status_code < 400 and "Content-Encoding" not in response.headers:
+            size = int(response.headers.get("Content-Length", 0))
+            if size > MAX_FILE_SIZE:
+                return size
+        await response.aread()
+    finally:
+        await response.aclose()
+        
+    raise_for_github_error(response)
+    # Directories come back as the usual JSON listing
+    if response.headers.get("Content-Type", "").startswith("application/json"):
+        listing = response.json()
+        if isinstance(listing, list):
+            return listing
+    data = response.content
+    return len(data) if len(data) > MAX_FILE_SIZE else data
 
-def format_issue(issue: Issue) -> Dict[str, Any]:
-    """Format an issue object into a dictionary for easier JSON serialization"""
+def format_issue(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Format an issue from the API into a dictionary for easier JSON serialization"""
     return {
-        "number": issue.number,
-        "title": issue.title,
-        "state": issue.state,
-        "created_at": issue.created_at.isoformat() if issue.created_at else None,
-        "updated_at": issue.updated_at.isoformat() if issue.updated_at else None,
-        "closed_at": issue.closed_at.isoformat() if issue.closed_at else None,
-        "body": issue.body,
-        "url": issue.html_url,
-        "user": issue.user.login if issue.user else None,
-        "labels": [label.name for label in issue.labels],
-        "assignees": [assignee.login for assignee in issue.assignees],
-        "comments": issue.comments
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"],
+        "created_at": issue.get("created_at"),
+        "updated_at": issue.get("updated_at"),
+        "closed_at": issue.get("closed_at"),
+        "body": issue.get("body"),
+        "url": issue["html_url"],
+        "user": issue["user"]["login"] if issue.get("user") else None,
+        "labels": [label["name"] for label in issue.get("labels", [])],
+        "assignees": [assignee["login"] for assignee in issue.get("assignees", [])],
+        "comments": issue.get("comments")
     }
 
-def format_pull_request(pr: PullRequest) -> Dict[str, Any]:
-    """Format a pull request object into a dictionary for easier JSON serialization"""
+def format_issue_node(issue: Dict[str, Any]) -> Dict[str, Any]:
+    """Format an issue from a GraphQL ISSUES_QUERY result like format_issue does"""
     return {
-        "number": pr.number,
-        "title": pr.title,
-        "state": pr.state,
-        "created_at": pr.created_at.isoformat() if pr.created_at else None,
-        "updated_at": pr.updated_at.isoformat() if pr.updated_at else None,
-        "closed_at": pr.closed_at.isoformat() if pr.closed_at else None,
-        "merged_at": pr.merged_at.isoformat() if pr.merged_at else None,
-        "body": pr.body,
-        "url": pr.html_url,
-        "user": pr.user.login if pr.user else None,
-        "head": pr.head.ref,
-        "base": pr.base.ref,
-        "mergeable": pr.mergeable,
-        "draft": pr.draft
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"].lower(),
+        "created_at": issue["createdAt"],
+        "updated_at": issue["updatedAt"],
+        "closed_at": issue["closedAt"],
+        "body": issue["body"],
+        "url": issue["url"],
+        "user": issue["author"]["login"] if issue["author"] else None,
+        "labels": [label["name"] for label in issue["labels"]["nodes"]],
+        "assignees": [assignee["login"] for assignee in issue["assignees"]["nodes"]],
+        "comments": issue["comments"]["totalCount"]
     }
 
-def format_repo(repo: Repository) -> Dict[str, Any]:
-    """Format a repository object into a dictionary for easier JSON serialization"""
+def format_pull_request(pr: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a pull request from the API into a dictionary for easier JSON serialization"""
     return {
-        "name": repo.name,
-        "full_name": repo.full_name,
-        "description": repo.description,
-        "url": repo.html_url,
-        "stars": repo.stargazers_count,
-        "forks": repo.forks_count,
-        "open_issues": repo.open_issues_count,
-        "private": repo.private,
-        "default_branch": repo.default_branch,
-        "language": repo.language,
-        "created_at": repo.created_at.isoformat() if repo.created_at else None,
-        "updated_at": repo.updated_at.isoformat() if repo.updated_at else None,
-        "pushed_at": repo.pushed_at.isoformat() if repo.pushed_at else None
+        "number": pr["number"],
+        "title": pr["title"],
+        "state": pr["state"],
+        "created_at": pr.get("created_at"),
+        "updated_at": pr.get("updated_at"),
+        "closed_at": pr.get("closed_at"),
+        "merged_at": pr.get("merged_at"),
+        "body": pr.get("body"),
+        "url": pr["html_url"],
+        "user": pr["user"]["login"] if pr.get("user") else None,
+        "head": pr["head"]["ref"],
+        "base": pr["base"]["ref"],
+        "mergeable": pr.get("mergeable"),
+        "draft": pr.get("draft")
+    }
+
+def format_pull_request_node(pr: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a pull request from a GraphQL PULL_REQUESTS_QUERY result like format_pull_request does"""
+    return {
+        "number": pr["number"],
+        "title": pr["title"],
+        "state": "open" if pr["state"] == "OPEN" else "closed",  # REST reports merged PRs as closed
+        "created_at": pr["createdAt"],
+        "updated_at": pr["updatedAt"],
+        "closed_at": pr["closedAt"],
+        "merged_at": pr["mergedAt"],
+        "body": pr["body"],
+        "url": pr["url"],
+        "user": pr["author"]["login"] if pr["author"] else None,
+        "head": pr["headRefName"],
+        "base": pr["baseRefName"],
+        "mergeable": MERGEABLE_STATES.get(pr["mergeable"]),
+        "draft": pr["isDraft"]
+    }
+
+def format_repo(repo: Dict[str, Any]) -> Dict[str, Any]:
+    """Format a repository from the API into a dictionary for easier JSON serialization"""
+    return {
+        "name": repo["name"],
+        "full_name": repo["full_name"],
+        "description": repo.get("description"),
+        "url": repo["html_url"],
+        "stars": repo.get("stargazers_count"),
+        "forks": repo.get("forks_count"),
+        "open_issues": repo.get("open_issues_count"),
+        "private": repo.get("private"),
+        "default_branch": repo.get("default_branch"),
+        "language": repo.get("language"),
+        "created_at": repo.get("created_at"),
+        "updated_at": repo.get("updated_at"),
+        "pushed_at": repo.get("pushed_at")
     }
 
 # --- Repository Tools ---
 
 @mcp.tool()
-def list_repos(visibility: str = "all", max_count: int = 10) -> str:
+@single_flight
+async def list_repos(visibility: str = "all", max_count: int = 10) -> str:
     """
     List repositories for the authenticated user.
     
@@ -119,35 +558,31 @@ def list_repos(visibility: str = "all", max_count: int = 10) -> str:
         max_count: Maximum number of repositories to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
         # Validate visibility parameter
         if visibility not in ["all", "public", "private"]:
             return f"Error: Invalid visibility parameter. Must be 'all', 'public', or 'private'."
-        
+            
         # Get list of repositories
-        user = g.get_user()
-        if visibility == "all":
-            repos = user.get_repos()
-        elif visibility == "public":
-            repos = user.get_repos(visibility="public")
-        else:  # private
-            repos = user.get_repos(visibility="private")
+        params = {"visibility": visibility} if visibility != "all" else None
+        repos = await github_paginate("/user/repos", max_count, params=params)
         
         # Format and return repository data
         result = []
-        for repo in repos[:max_count]:
+        for repo in repos:
             result.append(format_repo(repo))
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        return dumps_indented(result)
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error listing repositories: {str(e)}"
 
 @mcp.tool()
-def get_repo_info(repo_name: str) -> str:
+@single_flight
+async def get_repo_info(repo_name: str) -> str:
     """
     Get detailed information about a repository.
     
@@ -155,18 +590,23 @@ def get_repo_info(repo_name: str) -> str:
         repo_name: Repository name (format: "owner/repo" or just "repo" for your own repos)
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        return json.dumps(format_repo(repo), indent=2)
-    except GithubException as e:
+        result = REPO_CACHE.get(repo_name)
+        if result is None:
+            repo = await get_repo(repo_name)
+            result = dumps_indented(format_repo(repo))
+            REPO_CACHE.set(repo_name, result)
+        return result
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error getting repository info: {str(e)}"
 
 @mcp.tool()
-def list_branches(repo_name: str, max_count: int = 20) -> str:
+@single_flight
+async def list_branches(repo_name: str, max_count: int = 20) -> str:
     """
     List branches in a repository.
     
@@ -175,22 +615,29 @@ def list_branches(repo_name: str, max_count: int = 20) -> str:
         max_count: Maximum number of branches to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        branches = list(repo.get_branches()[:max_count])
+        cache_key = (repo_name, max_count)
+        cached = BRANCHES_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+            
+        repo_path = await get_repo_path(repo_name)
+        branches = await github_paginate(f"{repo_path}/branches", max_count)
         
         result = []
         for branch in branches:
             result.append({
-                "name": branch.name,
-                "protected": branch.protected,
-                "commit_sha": branch.commit.sha if branch.commit else None
+                "name": branch["name"],
+                "protected": branch.get("protected"),
+                "commit_sha": branch["commit"]["sha"] if branch.get("commit") else None
             })
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        result = dumps_indented(result)
+        BRANCHES_CACHE.set(cache_key, result)
+        return result
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error listing branches: {str(e)}"
@@ -198,7 +645,8 @@ def list_branches(repo_name: str, max_count: int = 20) -> str:
 # --- File Operations ---
 
 @mcp.tool()
-def list_files(repo_name: str, path: str = "", branch: str = None) -> str:
+@single_flight
+async def list_files(repo_name: str, path: str = "", branch: str = None) -> str:
     """
     List files and directories in a repository path.
     
@@ -208,11 +656,11 @@ def list_files(repo_name: str, path: str = "", branch: str = None) -> str:
         branch: Branch name (default: repository's default branch)
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        contents = repo.get_contents(path, ref=branch)
+        repo_path = await get_repo_path(repo_name)
+        contents = await get_contents(repo_path, path, branch)
         
         result = []
         # Handle case where contents is a single file
@@ -221,21 +669,22 @@ def list_files(repo_name: str, path: str = "", branch: str = None) -> str:
             
         for content in contents:
             result.append({
-                "name": content.name,
-                "path": content.path,
-                "type": "file" if content.type == "file" else "directory",
-                "size": content.size if content.type == "file" else None,
-                "url": content.html_url
+                "name": content["name"],
+                "path": content["path"],
+                "type": "file" if content["type"] == "file" else "directory",
+                "size": content["size"] if content["type"] == "file" else None,
+                "url": content["html_url"]
             })
             
-        return json.dumps(sorted(result, key=lambda x: (x["type"], x["name"])), indent=2)
-    except GithubException as e:
+        return dumps_indented(sorted(result, key=lambda x: (x["type"], x["name"])))
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error listing files: {str(e)}"
 
 @mcp.tool()
-def get_file_content(repo_name: str, file_path: str, branch: str = None) -> str:
+@single_flight
+async def get_file_content(repo_name: str, file_path: str, branch: str = None) -> str:
     """
     Get the content of a file from a repository.
     
@@ -245,33 +694,33 @@ def get_file_content(repo_name: str, file_path: str, branch: str = None) -> str:
         branch: Branch name (default: repository's default branch)
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        content_file = repo.get_contents(file_path, ref=branch)
+        repo_path = await get_repo_path(repo_name)
+        data = await get_raw_file(repo_path, file_path, branch)
         
         # Handle binary files vs text files
-        if isinstance(content_file, list):
+        if isinstance(data, list):
             return "Error: Path is a directory, not a file."
             
-        if content_file.size > 1000000:  # 1MB limit
-            return f"Error: File is too large to display ({content_file.size} bytes)"
+        if isinstance(data, int):  # 1MB limit
+            return f"Error: File is too large to display ({data} bytes)"
             
         try:
             # Try to decode as text - this will work for most code files
-            content = base64.b64decode(content_file.content).decode('utf-8')
+            content = data.decode('utf-8')
             return content
         except UnicodeDecodeError:
             # If it fails, it's likely a binary file
-            return f"Binary file: {content_file.name} ({content_file.size} bytes)"
-    except GithubException as e:
+            return f"Binary file: {file_path.rsplit('/', 1)[-1]} ({len(data)} bytes)"
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error getting file content: {str(e)}"
 
 @mcp.tool()
-def create_file(repo_name: str, file_path: str, content: str, commit_message: str, branch: str = None) -> str:
+async def create_file(repo_name: str, file_path: str, content: str, commit_message: str, branch: str = None) -> str:
     """
     Create a new file in a repository.
     
@@ -283,45 +732,46 @@ def create_file(repo_name: str, file_path: str, content: str, commit_message: st
         branch: Branch name (default: repository's default branch)
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        
-        # Check if file already exists
-        try:
-            repo.get_contents(file_path, ref=branch)
-            return f"Error: File already exists at {file_path}"
-        except GithubException as e:
-            if e.status != 404:  # If error is not "Not Found"
-                raise
+        repo_path = await get_repo_path(repo_name)
         
         # Create the file
-        result = repo.create_file(
-            path=file_path,
-            message=commit_message,
-            content=content,
-            branch=branch
-        )
+        payload = {
+            "message": commit_message,
+            "content": base64.b64encode(content.encode('utf-8')).decode('ascii')
+        }
+        if branch:
+            payload["branch"] = branch
+        try:
+            result = await github_request("PUT", f"{repo_path}/contents/{quote(file_path)}", json=payload)
+        except GitHubAPIError as e:
+            # Without a "sha" this PUT can only create, so GitHub rejects it
+            # when the file already exists; no separate existence check needed
+            if e.status == 422 and '"sha"' in e.data.get("message", ""):
+                return f"Error: File already exists at {file_path}"
+            raise
+        FILE_CACHE.pop((repo_name, file_path))
         
-        return json.dumps({
+        return dumps_indented({
             "file": {
                 "path": file_path,
-                "url": result["content"].html_url
+                "url": result["content"]["html_url"]
             },
             "commit": {
-                "sha": result["commit"].sha,
-                "message": result["commit"].message,
-                "url": result["commit"].html_url
+                "sha": result["commit"]["sha"],
+                "message": result["commit"]["message"],
+                "url": result["commit"]["html_url"]
             }
-        }, indent=2)
-    except GithubException as e:
+        })
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error creating file: {str(e)}"
 
 @mcp.tool()
-def update_file(repo_name: str, file_path: str, content: str, commit_message: str, branch: str = None) -> str:
+async def update_file(repo_name: str, file_path: str, content: str, commit_message: str, branch: str = None) -> str:
     """
     Update an existing file in a repository.
     
@@ -333,35 +783,49 @@ def update_file(repo_name: str, file_path: str, content: str, commit_message: st
         branch: Branch name (default: repository's default branch)
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        
-        # Get the current file to get its SHA
-        file = repo.get_contents(file_path, ref=branch)
+        full_name = await get_repo_full_name(repo_name)
+        repo_path = f"/repos/{full_name}"
         
-        # Update the file
-        result = repo.update_file(
-            path=file_path,
-            message=commit_message,
-            content=content,
-            sha=file.sha,
-            branch=branch
-        )
+        # Get the current file's SHA; asking GraphQL for just the object id
+        # avoids downloading the whole file as base64 only to read one field
+        owner, name = full_name.split("/", 1)
+        data = await github_graphql(FILE_SHA_QUERY, {
+            "owner": owner,
+            "name": name,
+            "expression": f"{branch or 'HEAD'}:{file_path}"
+        })
+        file = data["repository"]["object"]
+        if file is None:
+            raise GitHubAPIError(404, {"message": "Not Found"})
+        if file["__typename"] != "Blob":
+            return "Error: Path is a directory, not a file."
+            
+        # Update the file (the content is encoded to base64 once, here)
+        payload = {
+            "message": commit_message,
+            "content": base64.b64encode(content.encode('utf-8')).decode('ascii'),
+            "sha": file["oid"]
+        }
+        if branch:
+            payload["branch"] = branch
+        result = await github_request("PUT", f"{repo_path}/contents/{quote(file_path)}", json=payload)
+        FILE_CACHE.pop((repo_name, file_path))
         
-        return json.dumps({
+        return dumps_indented({
             "file": {
                 "path": file_path,
-                "url": result["content"].html_url
+                "url": result["content"]["html_url"]
             },
             "commit": {
-                "sha": result["commit"].sha,
-                "message": result["commit"].message,
-                "url": result["commit"].html_url
+                "sha": result["commit"]["sha"],
+                "message": result["commit"]["message"],
+                "url": result["commit"]["html_url"]
             }
-        }, indent=2)
-    except GithubException as e:
+        })
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error updating file: {str(e)}"
@@ -369,7 +833,8 @@ def update_file(repo_name: str, file_path: str, content: str, commit_message: st
 # --- Issue and PR Tools ---
 
 @mcp.tool()
-def list_issues(repo_name: str, state: str = "open", max_count: int = 10) -> str:
+@single_flight
+async def list_issues(repo_name: str, state: str = "open", max_count: int = 10) -> str:
     """
     List issues in a repository.
     
@@ -379,32 +844,33 @@ def list_issues(repo_name: str, state: str = "open", max_count: int = 10) -> str
         max_count: Maximum number of issues to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
         # Validate state parameter
         if state not in ["open", "closed", "all"]:
             return f"Error: Invalid state parameter. Must be 'open', 'closed', or 'all'."
             
-        repo = get_repo(repo_name)
-        issues = repo.get_issues(state=state)
+        owner, name = (await get_repo_full_name(repo_name)).split("/", 1)
+        issues = await github_graphql_nodes(
+            ISSUES_QUERY, "issues",
+            {"owner": owner, "name": name, "states": ISSUE_STATES[state]},
+            max_count
+        )
         
         result = []
-        for issue in issues[:max_count]:
-            # Skip pull requests (they are also returned as issues by the API)
-            if issue.pull_request:
-                continue
-                
-            result.append(format_issue(issue))
+        for issue in issues:
+            result.append(format_issue_node(issue))
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        return dumps_indented(result)
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error listing issues: {str(e)}"
 
 @mcp.tool()
-def get_issue(repo_name: str, issue_number: int) -> str:
+@single_flight
+async def get_issue(repo_name: str, issue_number: int) -> str:
     """
     Get details of a specific issue.
     
@@ -413,24 +879,24 @@ def get_issue(repo_name: str, issue_number: int) -> str:
         issue_number: Issue number
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        issue = repo.get_issue(number=issue_number)
+        repo_path = await get_repo_path(repo_name)
+        issue = await github_request("GET", f"{repo_path}/issues/{issue_number}")
         
         # Check if it's actually a pull request
-        if issue.pull_request:
+        if issue.get("pull_request"):
             return f"Error: Issue #{issue_number} is actually a pull request. Use get_pull_request instead."
             
-        return json.dumps(format_issue(issue), indent=2)
-    except GithubException as e:
+        return dumps_indented(format_issue(issue))
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error getting issue: {str(e)}"
 
 @mcp.tool()
-def create_issue(repo_name: str, title: str, body: str, labels: List[str] = None) -> str:
+async def create_issue(repo_name: str, title: str, body: str, labels: List[str] = None) -> str:
     """
     Create a new issue in a repository.
     
@@ -441,26 +907,26 @@ def create_issue(repo_name: str, title: str, body: str, labels: List[str] = None
         labels: List of labels to apply to the issue
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
+        repo_path = await get_repo_path(repo_name)
         
         # Create the issue
-        issue = repo.create_issue(
-            title=title,
-            body=body,
-            labels=labels
-        )
+        payload = {"title": title, "body": body}
+        if labels:
+            payload["labels"] = labels
+        issue = await github_request("POST", f"{repo_path}/issues", json=payload)
         
-        return json.dumps(format_issue(issue), indent=2)
-    except GithubException as e:
+        return dumps_indented(format_issue(issue))
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error creating issue: {str(e)}"
 
 @mcp.tool()
-def list_pull_requests(repo_name: str, state: str = "open", max_count: int = 10) -> str:
+@single_flight
+async def list_pull_requests(repo_name: str, state: str = "open", max_count: int = 10) -> str:
     """
     List pull requests in a repository.
     
@@ -470,28 +936,35 @@ def list_pull_requests(repo_name: str, state: str = "open", max_count: int = 10)
         max_count: Maximum number of pull requests to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
         # Validate state parameter
         if state not in ["open", "closed", "all"]:
             return f"Error: Invalid state parameter. Must be 'open', 'closed', or 'all'."
             
-        repo = get_repo(repo_name)
-        pulls = repo.get_pulls(state=state)
+        # Unlike the REST list endpoint, GraphQL includes mergeability, so
+        # there is no follow-up request per pull request
+        owner, name = (await get_repo_full_name(repo_name)).split("/", 1)
+        pulls = await github_graphql_nodes(
+            PULL_REQUESTS_QUERY, "pullRequests",
+            {"owner": owner, "name": name, "states": PULL_REQUEST_STATES[state]},
+            max_count
+        )
         
         result = []
-        for pr in pulls[:max_count]:
-            result.append(format_pull_request(pr))
+        for pr in pulls:
+            result.append(format_pull_request_node(pr))
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        return dumps_indented(result)
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error listing pull requests: {str(e)}"
 
 @mcp.tool()
-def get_pull_request(repo_name: str, pr_number: int) -> str:
+@single_flight
+async def get_pull_request(repo_name: str, pr_number: int) -> str:
     """
     Get details of a specific pull request.
     
@@ -500,20 +973,20 @@ def get_pull_request(repo_name: str, pr_number: int) -> str:
         pr_number: Pull request number
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
-        pr = repo.get_pull(number=pr_number)
+        repo_path = await get_repo_path(repo_name)
+        pr = await github_request("GET", f"{repo_path}/pulls/{pr_number}")
         
-        return json.dumps(format_pull_request(pr), indent=2)
-    except GithubException as e:
+        return dumps_indented(format_pull_request(pr))
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error getting pull request: {str(e)}"
 
 @mcp.tool()
-def create_pull_request(repo_name: str, title: str, body: str, head: str, base: str = "main", draft: bool = False) -> str:
+async def create_pull_request(repo_name: str, title: str, body: str, head: str, base: str = "main", draft: bool = False) -> str:
     """
     Create a new pull request.
     
@@ -526,22 +999,22 @@ def create_pull_request(repo_name: str, title: str, body: str, head: str, base:
         draft: Whether to create a draft PR
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        repo = get_repo(repo_name)
+        repo_path = await get_repo_path(repo_name)
         
         # Create the pull request
-        pr = repo.create_pull(
-            title=title,
-            body=body,
-            head=head,
-            base=base,
-            draft=draft
-        )
+        pr = await github_request("POST", f"{repo_path}/pulls", json={
+            "title": title,
+            "body": body,
+            "head": head,
+            "base": base,
+            "draft": draft
+        })
         
-        return json.dumps(format_pull_request(pr), indent=2)
-    except GithubException as e:
+        return dumps_indented(format_pull_request(pr))
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error creating pull request: {str(e)}"
@@ -549,7 +1022,8 @@ def create_pull_request(repo_name: str, title: str, body: str, head: str, base:
 # --- Repository Resources ---
 
 @mcp.resource("github://repo/{repo_name}")
-def repo_resource(repo_name: str) -> str:
+@single_flight
+async def repo_resource(repo_name: str) -> str:
     """
     Get repository information as a resource.
     
@@ -557,19 +1031,24 @@ def repo_resource(repo_name: str) -> str:
         repo_name: Repository name (format: "owner/repo")
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        # Replace URL-encoded slashes with actual slashes
-        repo_name = repo_name.replace("%2F", "/")
+        # Decode URL-encoded characters (e.g. %2F for slashes)
+        repo_name = unquote(repo_name)
         
-        repo = get_repo(repo_name)
-        return json.dumps(format_repo(repo), indent=2)
+        result = REPO_CACHE.get(repo_name)
+        if result is None:
+            repo = await get_repo(repo_name)
+            result = dumps_indented(format_repo(repo))
+            REPO_CACHE.set(repo_name, result)
+        return result
     except Exception as e:
         return f"Error fetching repository resource: {str(e)}"
 
 @mcp.resource("github://file/{repo_name}/{file_path}")
-def file_resource(repo_name: str, file_path: str) -> str:
+@single_flight
+async def file_resource(repo_name: str, file_path: str) -> str:
     """
     Get file content as a resource.
     
@@ -578,34 +1057,40 @@ def file_resource(repo_name: str, file_path: str) -> str:
         file_path: Path to the file within the repository
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        # Replace URL-encoded slashes with actual slashes
-        repo_name = repo_name.replace("%2F", "/")
-        file_path = file_path.replace("%2F", "/")
+        # Decode URL-encoded characters (e.g. %2F for slashes)
+        repo_name = unquote(repo_name)
+        file_path = unquote(file_path)
         
-        repo = get_repo(repo_name)
-        content_file = repo.get_contents(file_path)
+        cached = FILE_CACHE.get((repo_name, file_path))
+        if cached is not None:
+            return cached
+            
+        repo_path = await get_repo_path(repo_name)
+        data = await get_raw_file(repo_path, file_path)
         
-        if isinstance(content_file, list):
+        if isinstance(data, list):
             return f"Error: Path is a directory, not a file: {file_path}"
             
-        if content_file.size > 1000000:  # 1MB limit
-            return f"Error: File is too large to display ({content_file.size} bytes)"
+        if isinstance(data, int):  # 1MB limit
+            return f"Error: File is too large to display ({data} bytes)"
             
         try:
             # Try to decode as text - this will work for most code files
-            content = base64.b64decode(content_file.content).decode('utf-8')
+            content = data.decode('utf-8')
+            FILE_CACHE.set((repo_name, file_path), content)
             return content
         except UnicodeDecodeError:
             # If it fails, it's likely a binary file
-            return f"Binary file: {content_file.name} ({content_file.size} bytes)"
+            return f"Binary file: {file_path.rsplit('/', 1)[-1]} ({len(data)} bytes)"
     except Exception as e:
         return f"Error fetching file resource: {str(e)}"
 
 @mcp.resource("github://readme/{repo_name}")
-def readme_resource(repo_name: str) -> str:
+@single_flight
+async def readme_resource(repo_name: str) -> str:
     """
     Get repository README as a resource.
     
@@ -613,21 +1098,26 @@ def readme_resource(repo_name: str) -> str:
         repo_name: Repository name (format: "owner/repo")
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        # Replace URL-encoded slashes with actual slashes
-        repo_name = repo_name.replace("%2F", "/")
+        # Decode URL-encoded characters (e.g. %2F for slashes)
+        repo_name = unquote(repo_name)
         
-        repo = get_repo(repo_name)
-        readme = repo.get_readme()
+        cached = README_CACHE.get(repo_name)
+        if cached is not None:
+            return cached
+            
+        repo_path = await get_repo_path(repo_name)
+        readme = await github_send("GET", f"{repo_path}/readme", headers={"Accept": RAW_MEDIA_TYPE})
         
         try:
-            content = base64.b64decode(readme.content).decode('utf-8')
+            content = readme.content.decode('utf-8')
+            README_CACHE.set(repo_name, content)
             return content
         except UnicodeDecodeError:
             return f"Error: Unable to decode README content"
-    except GithubException as e:
+    except GitHubAPIError as e:
         if e.status == 404:
             return f"No README found in repository {repo_name}"
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
@@ -637,7 +1127,8 @@ def readme_resource(repo_name: str) -> str:
 # --- Search Tools ---
 
 @mcp.tool()
-def search_code(query: str, max_count: int = 10) -> str:
+@single_flight
+async def search_code(query: str, max_count: int = 10) -> str:
     """
     Search for code across GitHub.
     
@@ -646,29 +1137,30 @@ def search_code(query: str, max_count: int = 10) -> str:
         max_count: Maximum number of results to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        search_results = g.search_code(query=query)
+        search_results = await github_paginate("/search/code", max_count, params={"q": query}, items_key="items")
         
         result = []
-        for item in search_results[:max_count]:
+        for item in search_results:
             result.append({
-                "repository": item.repository.full_name,
-                "path": item.path,
-                "name": item.name,
-                "url": item.html_url,
-                "score": item.score
+                "repository": item["repository"]["full_name"],
+                "path": item["path"],
+                "name": item["name"],
+                "url": item["html_url"],
+                "score": item.get("score")
             })
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        return dumps_indented(result)
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error searching code: {str(e)}"
 
 @mcp.tool()
-def search_repositories(query: str, max_count: int = 10) -> str:
+@single_flight
+async def search_repositories(query: str, max_count: int = 10) -> str:
     """
     Search for repositories across GitHub.
     
@@ -677,59 +1169,48 @@ def search_repositories(query: str, max_count: int = 10) -> str:
         max_count: Maximum number of results to return
     """
     try:
-        if not g:
+        if not clients:
             return "Error: GitHub client not initialized. Please check your GITHUB_TOKEN."
             
-        search_results = g.search_repositories(query=query)
+        search_results = await github_paginate("/search/repositories", max_count, params={"q": query}, items_key="items")
         
         result = []
-        for item in search_results[:max_count]:
+        for item in search_results:
             result.append(format_repo(item))
             
-        return json.dumps(result, indent=2)
-    except GithubException as e:
+        return dumps_indented(result)
+    except GitHubAPIError as e:
         return f"GitHub API Error ({e.status}): {e.data.get('message', str(e))}"
     except Exception as e:
         return f"Error searching repositories: {str(e)}"
 
-# Create Starlette application with the MCP SSE app mounted at the root
+# The MCP SSE ASGI app, built once (this walks the registered tools and resources)
+SSE_APP = mcp.sse_app()
+
+# Create Starlette application with the MCP SSE app mounted at the root and
+# CORS middleware declared up front; this is the single ASGI entry point, also
+# importable as github_server:app by an external server
 app = Starlette(
     routes=[
-        Mount('/', app=mcp.sse_app()),
+        Mount('/', app=SSE_APP),
+    ],
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],  # For development; restrict in production
+            allow_credentials=True,
+            allow_methods=["*"],
+            allow_headers=["*"],
+        ),
     ]
 )
 
-# Add CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # For development; restrict in production
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
 if __name__ == "__main__":
     # Check if run with --web flag
     if len(sys.argv) > 1 and sys.argv[1] == "--web":
         # Web mode (SSE)
         import uvicorn
         
-        # Create Starlette application
-        app = Starlette(
-            routes=[
-                Mount('/', app=mcp.sse_app()),
-            ]
-        )
-        
-        # Add CORS middleware
-        app.add_middleware(
-            CORSMiddleware,
-            allow_origins=["*"],
-            allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
-        )
-        
         # Get port from arguments or environment or default
         port = int(os.environ.get("MCP_PORT", 8003))
         if len(sys.argv) > 2:
@@ -738,9 +1219,22 @@ if __name__ == "__main__":
             except ValueError:
                 pass
                 
+        # Use uvloop + httptools when installed; fall back to uvicorn's defaults otherwise
+        try:
+            import uvloop
+            loop = "uvloop"
+        except ImportError:
+            loop = "auto"
+        try:
+            import httptools
+            http = "httptools"
+        except ImportError:
+            http = "auto"
+            
+        # Serve the module-level app (SSE mount + CORS) built above
         print(f"Starting Web MCP server on port {port}")
-        uvicorn.run(app, host="127.0.0.1", port=port)
+        uvicorn.run(app, host="127.0.0.1", port=port, loop=loop, http=http)
     else:
         # STDIO mode - for Claude Desktop
         print("Starting STDIO MCP server")
-        mcp.run(transport='stdio')
\ No newline at end of file
+        mcp.run(transport='stdio')
@@ -10,8 +10,12 @@ import os
 import sys
 import re
 import json
+import functools
+import bisect
+import threading
+import time
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Tuple
 from mcp.server.fastmcp import FastMCP, Context
 
 # Configure paths
@@ -26,21 +30,43 @@ if not MCP_DOCS_DIR.exists():
 
 print(f"Using MCP documentation from: {MCP_DOCS_DIR}")
 
+# Resolved once so containment checks only have to resolve the requested path
+MCP_DOCS_RESOLVED = MCP_DOCS_DIR.resolve()
+
 # Create an MCP server
 mcp = FastMCP("mcp-docs")
 
-# Dictionary to store cached content
+# Dictionary to store cached content: path -> (mtime_ns, size, content)
 CONTENT_CACHE = {}
 
-def read_file_content(file_path: Path) -> str:
-    """Read and cache file content"""
-    if str(file_path) in CONTENT_CACHE:
-        return CONTENT_CACHE[str(file_path)]
+# Search prefilter: path -> (mtime_ns, size, set of casefolded trigrams)
+TRIGRAM_INDEX = {}
+TRIGRAM_PATTERN = re.compile('(?s)...')
+# re.IGNORECASE matches these against an ASCII "i" but casefold() doesn't
+CASEFOLD_FIXUPS = str.maketrans({'\u0130': 'i', '\u0131': 'i'})
+
+# Files searched by search_mcp_docs
+SEARCH_EXTENSIONS = ('.txt', '.md', '.py')
+MAX_SEARCH_FILE_SIZE = 10 * 1024 * 1024  # 10 MB limit
+
+# Rendered directory listings: name -> (built_at, markdown)
+LISTING_CACHE = {}
+LISTING_TTL = 30  # seconds
+
+def read_file_content(file_path: Path, stat: Optional[os.stat_result] = None) -> str:
+    """Read and cache file content, reading it again if the file has changed"""
+    key = str(file_path)
     
     try:
+        if stat is None:
+            stat = os.stat(key)
+        cached = CONTENT_CACHE.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return cached[2]
+        
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
-            CONTENT_CACHE[str(file_path)] = content
+            CONTENT_CACHE[key] = (stat.st_mtime_ns, stat.st_size, content)
             return content
     except Exception as e:
         return f"Error reading file: {str(e)}"
@@ -50,56 +76,130 @@ def get_file_list(directory: Path) -> List[Dict[str, Any]]:
     files = []
     
     try:
-        for item in directory.iterdir():
-            if item.is_file():
-                files.append({
-                    "name": item.name,
-                    "path": str(item.relative_to(MCP_DOCS_DIR)),
-                    "type": "file",
-                    "size": item.stat().st_size,
-                })
-            elif item.is_dir() and not item.name.startswith('.'):
-                files.append({
-                    "name": item.name,
-                    "path": str(item.relative_to(MCP_DOCS_DIR)),
-                    "type": "directory",
-                })
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    files.append({
+                        "name": entry.name,
+                        "path": str(Path(entry.path).relative_to(MCP_DOCS_DIR)),
+                        "type": "file",
+                        "size": entry.stat().st_size,
+                    })
+                elif entry.is_dir() and not entry.name.startswith('.'):
+                    files.append({
+                        "name": entry.name,
+                        "path": str(Path(entry.path).relative_to(MCP_DOCS_DIR)),
+                        "type": "directory",
+                    })
     except Exception as e:
         print(f"Error listing files: {str(e)}")
     
     return sorted(files, key=lambda x: (x['type'], x['name']))
 
-def search_file_content(query: str, content: str) -> List[str]:
-    """Search for query in content and return matching lines with context"""
-    if not query or not content:
+def iter_files(directory: Union[str, Path]):
+    """Yield a DirEntry for every file under directory, in os.walk order"""
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError:
+        return
+    
+    subdirs = []
+    for entry in entries:
+        try:
+            is_dir = entry.is_dir()
+        except OSError:
+            is_dir = False
+        
+        if not is_dir:
+            yield entry
+        elif not entry.is_symlink():
+            subdirs.append(entry.path)
+    
+    for subdir in subdirs:
+        yield from iter_files(subdir)
+
+def get_trigrams(text: str) -> set:
+    """Get the set of casefolded trigrams in text"""
+    folded = text.translate(CASEFOLD_FIXUPS).casefold()
+    trigrams = set()
+    for offset in range(3):
+        trigrams.update(TRIGRAM_PATTERN.findall(folded, offset))
+    return trigrams
+
+def get_file_trigrams(file_path: Path, stat: os.stat_result) -> set:
+    """Get (and index) the trigrams of a file's content, rebuilding them if the file has changed"""
+    key = str(file_path)
+    cached = TRIGRAM_INDEX.get(key)
+    if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+        return cached[2]
+    
+    trigrams = get_trigrams(read_file_content(file_path, stat))
+    TRIGRAM_INDEX[key] = (stat.st_mtime_ns, stat.st_size, trigrams)
+    return trigrams
+
+def build_trigram_index():
+    """Index every searchable file up front so the first searches can skip files too"""
+    try:
+        for entry in iter_files(MCP_DOCS_DIR):
+            if entry.name.endswith(SEARCH_EXTENSIONS) and not entry.name.startswith('.'):
+                stat = entry.stat()
+                if stat.st_size <= MAX_SEARCH_FILE_SIZE:
+                    get_file_trigrams(Path(entry.path), stat)
+    except Exception as e:
+        print(f"Error building search index: {str(e)}", file=sys.stderr)
+
+@functools.lru_cache(maxsize=256)
+def compile_query(query: str) -> re.Pattern:
+    """Compile (and cache) a case-insensitive literal search pattern"""
+    return re.compile(re.escape(query), re.IGNORECASE)
+
+@functools.lru_cache(maxsize=64)
+def newline_offsets(content: str) -> List[int]:
+    """Get the offset of every newline in content (cached per file content)"""
+    return [match.start() for match in re.finditer('\n', content)]
+
+def search_file_content(query: str, content: str, pattern: Optional[re.Pattern] = None) -> List[Tuple[int, int, int, int]]:
+    """Search for query in content and return matching lines with context as (first line, last line, start, end) spans"""
+    # Matches never span lines, so a query containing a newline can't match
+    if not query or not content or '\n' in query:
         return []
     
-    lines = content.split('\n')
+    newlines = newline_offsets(content)
+    line_count = len(newlines) + 1
     results = []
-    pattern = re.compile(re.escape(query), re.IGNORECASE)
+    if pattern is None:
+        pattern = compile_query(query)
     
-    for i, line in enumerate(lines):
-        if pattern.search(line):
-            # Get context (lines before and after)
-            start = max(0, i - 2)
-            end = min(len(lines), i + 3)
-            
-            # Format the matching lines with context
-            context = lines[start:end]
-            context_str = "\n".join(context)
-            
-            # Add line numbers
-            line_info = f"[Lines {start+1}-{end}]"
-            
-            # Add to results
-            results.append(f"{line_info}\n{context_str}")
+    # Scan the whole content in one pass, mapping each hit to its line and
+    # resuming at the start of the next line so every line is reported once
+    match = pattern.search(content)
+    while match:
+        i = bisect.bisect_left(newlines, match.start())
+        # Get context (lines before and after)
+        start = max(0, i - 2)
+        end = min(line_count, i + 3)
+        
+        # Offsets of the matching lines with context within the content
+        context_start = newlines[start - 1] + 1 if start else 0
+        context_end = newlines[end - 1] if end <= len(newlines) else len(content)
+        
+        # Add to results
+        results.append((start + 1, end, context_start, context_end))
+        
+        if i == len(newlines):
+            break
+        match = pattern.search(content, newlines[i] + 1)
     
     return results
 
-# Resource: list of available files
-@mcp.resource("mcp://files")
-def get_files() -> str:
-    """List all available MCP documentation files"""
+def format_match(content: str, match: Tuple[int, int, int, int]) -> str:
+    """Format a match from search_file_content with its line numbers"""
+    first_line, last_line, context_start, context_end = match
+    return f"[Lines {first_line}-{last_line}]\n{content[context_start:context_end]}"
+
+def build_files_listing() -> str:
+    """Render the list of top-level documentation files"""
     files = get_file_list(MCP_DOCS_DIR)
     
     result = ["# Available MCP Documentation Files", ""]
@@ -113,6 +213,57 @@ def get_files() -> str:
     
     return "\n".join(result)
 
+def build_python_sdk_examples() -> str:
+    """Render the list of Python SDK examples"""
+    examples_dir = Path(MCP_DOCS_DIR, "python-sdk", "examples")
+    if not examples_dir.exists():
+        return "Python SDK examples directory not found."
+    
+    result = ["# Python SDK Examples", ""]
+    
+    # List all example directories
+    with os.scandir(examples_dir) as items:
+        example_dirs = [item for item in items if item.is_dir() and not item.name.startswith('.')]
+    
+    for item in example_dirs:
+        result.append(f"## {item.name}")
+        
+        # List files in the directory
+        example_files = []
+        with os.scandir(item.path) as files:
+            for file in files:
+                if file.is_file() and os.path.splitext(file.name)[1] == '.py':
+                    size_kb = file.stat().st_size / 1024
+                    example_files.append(f"- `{file.name}` ({size_kb:.1f} KB)")
+        
+        if example_files:
+            result.extend(example_files)
+            result.append("")
+        else:
+            result.append("No Python examples found.")
+            result.append("")
+    
+    if len(result) <= 2:
+        return "No Python SDK examples found."
+    
+    return "\n".join(result)
+
+def get_listing(name: str, build) -> str:
+    """Get a rendered listing, rebuilding it at most once every LISTING_TTL seconds"""
+    cached = LISTING_CACHE.get(name)
+    if cached and time.monotonic() - cached[0] < LISTING_TTL:
+        return cached[1]
+    
+    listing = build()
+    LISTING_CACHE[name] = (time.monotonic(), listing)
+    return listing
+
+# Resource: list of available files
+@mcp.resource("mcp://files")
+def get_files() -> str:
+    """List all available MCP documentation files"""
+    return get_listing("files", build_files_listing)
+
 # Resource: MCP overview
 @mcp.resource("mcp://overview")
 def get_overview() -> str:
@@ -205,13 +356,13 @@ def get_file(file_path: str) -> str:
         safe_path = Path(file_path).parts
         file_path = Path(MCP_DOCS_DIR, *safe_path)
         
-        # Check if the file exists and is within MCP_DOCS_DIR
+        # Check that the file is within MCP_DOCS_DIR (after resolving ".." and symlinks) and exists
+        if not file_path.resolve().is_relative_to(MCP_DOCS_RESOLVED):
+            return "Access denied: Path is outside the documentation directory"
+        
         if not file_path.exists():
             return f"File not found: {file_path}"
         
-        if not str(file_path).startswith(str(MCP_DOCS_DIR)):
-            return "Access denied: Path is outside the documentation directory"
-        
         if file_path.is_dir():
             # If it's a directory, list its contents
             files = get_file_list(file_path)
@@ -250,38 +401,46 @@ def search_mcp_docs(query: str, ctx: Context = None) -> str:
     
     try:
         results = []
+        pattern = compile_query(query)
+        
+        # Only files containing every trigram of the query can match. Casefolding
+        # agrees with re.IGNORECASE for ASCII queries, so others scan every file.
+        query_trigrams = get_trigrams(query) if query.isascii() else None
         
         # Search through all files in the MCP_DOCS_DIR
-        for root, _, files in os.walk(MCP_DOCS_DIR):
-            for file in files:
-                if file.endswith(('.txt', '.md', '.py')) and not file.startswith('.'):
-                    file_path = Path(root, file)
-                    
-                    # Don't search in very large files
-                    if file_path.stat().st_size > 10 * 1024 * 1024:  # 10 MB limit
-                        if ctx:
-                            ctx.warning(f"Skipping large file: {file_path.relative_to(MCP_DOCS_DIR)}")
-                        continue
+        for entry in iter_files(MCP_DOCS_DIR):
+            if entry.name.endswith(SEARCH_EXTENSIONS) and not entry.name.startswith('.'):
+                file_path = Path(entry.path)
+                stat = entry.stat()
+                
+                # Don't search in very large files
+                if stat.st_size > MAX_SEARCH_FILE_SIZE:
+                    if ctx:
+                        ctx.warning(f"Skipping large file: {file_path.relative_to(MCP_DOCS_DIR)}")
+                    continue
+                
+                if query_trigrams is not None and not query_trigrams <= get_file_trigrams(file_path, stat):
+                    continue
+                
+                relative_path = file_path.relative_to(MCP_DOCS_DIR)
+                content = read_file_content(file_path, stat)
+                
+                # Search for matches in content
+                matches = search_file_content(query, content, pattern)
+                
+                if matches:
+                    results.append(f"## File: {relative_path}")
+                    results.append(f"Found {len(matches)} matches:\n")
                     
-                    relative_path = file_path.relative_to(MCP_DOCS_DIR)
-                    content = read_file_content(file_path)
+                    for i, match in enumerate(matches[:5], 1):  # Limit to first 5 matches
+                        results.append(f"### Match {i}:")
+                        results.append(format_match(content, match))
+                        results.append("")
                     
-                    # Search for matches in content
-                    matches = search_file_content(query, content)
+                    if len(matches) > 5:
+                        results.append(f"... and {len(matches) - 5} more matches.")
                     
-                    if matches:
-                        results.append(f"## File: {relative_path}")
-                        results.append(f"Found {len(matches)} matches:\n")
-                        
-                        for i, match in enumerate(matches[:5], 1):  # Limit to first 5 matches
-                            results.append(f"### Match {i}:")
-                            results.append(match)
-                            results.append("")
-                        
-                        if len(matches) > 5:
-                            results.append(f"... and {len(matches) - 5} more matches.")
-                        
-                        results.append("")
+                    results.append("")
         
         if not results:
             return f"No matches found for '{query}' in MCP documentation."
@@ -333,35 +492,7 @@ def list_python_sdk_examples(ctx: Context = None) -> str:
         List of available examples
     """
     try:
-        examples_dir = Path(MCP_DOCS_DIR, "python-sdk", "examples")
-        if not examples_dir.exists():
-            return "Python SDK examples directory not found."
-        
-        result = ["# Python SDK Examples", ""]
-        
-        # List all example directories
-        for item in examples_dir.iterdir():
-            if item.is_dir() and not item.name.startswith('.'):
-                result.append(f"## {item.name}")
-                
-                # List files in the directory
-                example_files = []
-                for file in item.iterdir():
-                    if file.is_file() and file.suffix == '.py':
-                        size_kb = file.stat().st_size / 1024
-                        example_files.append(f"- `{file.name}` ({size_kb:.1f} KB)")
-                
-                if example_files:
-                    result.extend(example_files)
-                    result.append("")
-                else:
-                    result.append("No Python examples found.")
-                    result.append("")
-        
-        if len(result) <= 2:
-            return "No Python SDK examples found."
-        
-        return "\n".join(result)
+        return get_listing("examples", build_python_sdk_examples)
         
     except Exception as e:
         error_message = f"Error listing Python SDK examples: {str(e)}"
@@ -419,5 +550,8 @@ if __name__ == "__main__":
     if not python_sdk_path.exists():
         print(f"Warning: Python SDK directory not found: {python_sdk_path}")
     
+    # Index the documentation in the background while the server starts
+    threading.Thread(target=build_trigram_index, daemon=True).start()
+    
     # Run the server
     mcp.run(transport='stdio')
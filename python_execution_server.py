@@ -6,10 +6,27 @@ import subprocess
 import json
 import time
 import uuid
+import re
+import io
+import hashlib
+import base64
+import tarfile
+import queue
+import socket
+import atexit
+import threading
+import concurrent.futures
 from starlette.applications import Starlette
 from starlette.middleware.cors import CORSMiddleware
 from starlette.routing import Mount
 
+# The Docker SDK talks to the engine's API directly; without it (or without a
+# reachable engine) every Docker operation goes through the CLI in WSL
+try:
+    import docker
+except ImportError:
+    docker = None
+
 # Create an MCP server
 mcp = FastMCP("Python Executor")
 
@@ -18,10 +35,77 @@ EXECUTION_DIR = os.path.join(tempfile.gettempdir(), "python_executor")
 DOCKER_IMAGE = "python:3.11-slim"  # Base Python image
 MAX_EXECUTION_TIME = 30  # Maximum execution time in seconds
 MEMORY_LIMIT = "512m"  # Memory limit for container
+CONTAINER_POOL_SIZE = 2  # Warm containers kept ready for executions
+MAX_CONTAINER_USES = 20  # Executions before a warm container is replaced
+CONTAINER_USER = "65534:65534"  # Warm containers run as nobody
+CONTAINER_PIDS_LIMIT = 64  # Process limit for warm containers
+CONTAINER_TMPFS_OPTIONS = "rw,nosuid,nodev,mode=1777,size=64m"  # The only writable paths in warm containers
+SCRUB_TIMEOUT = 10  # Maximum time to clean a warm container between runs, in seconds
+MAX_ARGUMENT_PAYLOAD = 1024 * 1024  # Largest execution (base64) passed to a warm container as exec arguments
+ARGUMENT_CHUNK_SIZE = 100000  # Stays below the kernel's per-argument limit
+EXECUTOR_IMAGE_REPOSITORY = "python-executor"  # Images with requirements baked in
+IMAGE_BUILD_TIMEOUT = 600  # Maximum time to build an image with requirements, in seconds
+CONTAINER_OWNER = f"{socket.gethostname()}:{os.getpid()}"  # Labels the warm containers this process starts
+
+# A pip requirement specifier: name, optional extras, optional version constraints
+REQUIREMENT_PATTERN = re.compile(r'[A-Za-z0-9][A-Za-z0-9._-]*(\[[A-Za-z0-9._,-]+\])?(\s*[<>=!~]=?\s*[A-Za-z0-9.*+_-]+)*')
 
 # Ensure execution directory exists
 os.makedirs(EXECUTION_DIR, exist_ok=True)
 
+# Idle warm containers as (container_id, uses)
+container_pool = queue.Queue()
+
+# Runs in a warm container: unpack the base64 tar of the execution's files
+# (from the arguments, or stdin when there are none) into /app, write the
+# marker to stderr, then exec the command there
+RUN_BOOTSTRAP = (
+    "import base64,io,os,sys,tarfile;"
+    "n=int(sys.argv[1]);"
+    "data=''.join(sys.argv[2:2+n]) if n else sys.stdin.read();"
+    "tarfile.open(fileobj=io.BytesIO(base64.b64decode(data))).extractall('/app');"
+    "sys.stderr.write(sys.argv[2+n]);sys.stderr.flush();"
+    "os.chdir('/app');"
+    "os.execvp(sys.argv[3+n],sys.argv[3+n:])"
+)
+
+# Runs in a warm container after each execution: kill every process but init
+# and this shell, remove SysV IPC objects and POSIX message queues, wipe the
+# writable paths, and fail if anything survived
+SCRUB_SCRIPT = (
+    "kill -9 -1 2>/dev/null;"
+    "ipcrm --all 2>/dev/null;"
+    "rm -rf /app/* /app/.[!.]* /app/..?* /tmp/* /tmp/.[!.]* /tmp/..?* /dev/shm/* /dev/shm/.[!.]* /dev/shm/..?* /dev/mqueue/* /dev/mqueue/.[!.]* /dev/mqueue/..?*;"
+    "for p in /proc/[0-9]*; do p=${p#/proc/}; [ \"$p\" = 1 ] || [ \"$p\" = $$ ] || exit 1; done;"
+    "for t in shm sem msg; do { read h && read h && exit 1; } < /proc/sysvipc/$t; done;"
+    "for f in /app/* /app/.[!.]* /app/..?* /tmp/* /tmp/.[!.]* /tmp/..?* /dev/shm/* /dev/shm/.[!.]* /dev/shm/..?* /dev/mqueue/* /dev/mqueue/.[!.]* /dev/mqueue/..?*; do { [ -e \"$f\" ] || [ -L \"$f\" ]; } && exit 1; done;"
+    "exit 0"
+)
+
+# Executor images known to exist, by requirements hash
+executor_images = {}
+executor_images_lock = threading.Lock()
+
+def connect_docker():
+    """Connect to the Docker Engine API, or return None to use the docker CLI in WSL"""
+    if docker is None:
+        return None
+    
+    try:
+        client = docker.from_env()
+        client.ping()
+        return client
+    except Exception:
+        return None
+
+docker_client = connect_docker()
+
+# Threads that wait on Docker SDK calls so they can be given a timeout
+docker_waiters = concurrent.futures.ThreadPoolExecutor(max_workers=4)
+
+# Threads that clean warm containers after a run, off the request path
+container_scrubbers = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+
 def sanitize_filename(filename):
     """Create a safe filename from user input"""
     safe_chars = set("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_-.")
@@ -31,6 +115,384 @@ def create_unique_execution_id():
     """Create a unique ID for this execution"""
     return str(uuid.uuid4())
 
+def wait_for(func, *args, timeout=None, **kwargs):
+    """Run a blocking Docker SDK call, raising subprocess.TimeoutExpired after timeout (default MAX_EXECUTION_TIME)"""
+    if timeout is None:
+        timeout = MAX_EXECUTION_TIME
+    future = docker_waiters.submit(func, *args, **kwargs)
+    try:
+        return future.result(timeout=timeout)
+    except concurrent.futures.TimeoutError:
+        raise subprocess.TimeoutExpired(func.__name__, timeout)
+
+def decode_output(output):
+    """Decode container output bytes (None if the stream was empty)"""
+    return output.decode('utf-8', errors='replace') if output else ""
+
+def docker_available():
+    """Check that the Docker engine is running, returning (available, details)"""
+    if docker_client is not None:
+        try:
+            docker_client.ping()
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+    
+    result = subprocess.run(["wsl", "docker", "ps"], capture_output=True, text=True)
+    return result.returncode == 0, result.stderr
+
+def image_available(image):
+    """Check whether an image is present locally"""
+    if docker_client is not None:
+        try:
+            docker_client.images.get(image)
+            return True
+        except docker.errors.ImageNotFound:
+            return False
+    
+    result = subprocess.run(["wsl", "docker", "image", "inspect", image], capture_output=True, text=True)
+    return result.returncode == 0
+
+def pull_image(image):
+    """Pull an image, returning (success, details)"""
+    if docker_client is not None:
+        try:
+            docker_client.images.pull(image)
+            return True, ""
+        except Exception as e:
+            return False, str(e)
+    
+    result = subprocess.run(["wsl", "docker", "pull", image], capture_output=True, text=True)
+    return result.returncode == 0, result.stderr
+
+def build_executor_image(requirements):
+    """Get an image with the given requirements installed, building it the first time"""
+    for requirement in requirements:
+        if not REQUIREMENT_PATTERN.fullmatch(requirement):
+            raise ValueError(f"Invalid requirement: {requirement}")
+    
+    packages = sorted(set(requirements))
+    digest = hashlib.sha256("\n".join(packages).encode('utf-8')).hexdigest()[:16]
+    tag = f"{EXECUTOR_IMAGE_REPOSITORY}:{digest}"
+    
+    with executor_images_lock:
+        if digest in executor_images or image_available(tag):
+            executor_images[digest] = tag
+            return tag
+        
+        # Exec form, so the package names never pass through a shell
+        dockerfile = (
+            f"FROM {DOCKER_IMAGE}\n"
+            f"RUN {json.dumps(['pip', 'install', '--no-cache-dir'] + packages)}\n"
+        )
+        labels = {"created_by": "python_executor", "requirements": ",".join(packages)}
+        
+        try:
+            if docker_client is not None:
+                wait_for(
+                    lambda: docker_client.images.build(
+                        fileobj=io.BytesIO(dockerfile.encode('utf-8')),
+                        tag=tag,
+                        labels=labels,
+                        rm=True,
+                        timeout=IMAGE_BUILD_TIMEOUT
+                    ),
+                    timeout=IMAGE_BUILD_TIMEOUT
+                )
+            else:
+                label_args = []
+                for key, value in labels.items():
+                    label_args.extend(["--label", f"{key}={value}"])
+                result = subprocess.run(
+                    ["wsl", "docker", "build", "--tag", tag] + label_args + ["-"],
+                    input=dockerfile,
+                    capture_output=True,
+                    text=True,
+                    timeout=IMAGE_BUILD_TIMEOUT
+                )
+                if result.returncode != 0:
+                    raise RuntimeError(f"Failed to install requirements: {result.stderr.strip()}")
+        except subprocess.TimeoutExpired:
+            # Not an execution timeout, so it must not be reported as one
+            raise RuntimeError(f"Requirements image build timed out after {IMAGE_BUILD_TIMEOUT} seconds")
+        
+        executor_images[digest] = tag
+        return tag
+
+def run_fresh_container(execution_dir, command, image=DOCKER_IMAGE):
+    """Run a command in a new single-use sandbox container with execution_dir mounted at /app"""
+    if docker_client is not None:
+        container = docker_client.containers.run(
+            image, command,
+            detach=True,
+            network_mode="none",
+            mem_limit=MEMORY_LIMIT,
+            nano_cpus=500000000,
+            working_dir="/app",
+            volumes={execution_dir: {"bind": "/app", "mode": "ro"}},
+            cap_drop=["ALL"],
+            security_opt=["no-new-privileges:true"]
+        )
+        try:
+            exit_code = wait_for(container.wait)["StatusCode"]
+            return subprocess.CompletedProcess(
+                command, exit_code,
+                decode_output(container.logs(stdout=True, stderr=False)),
+                decode_output(container.logs(stdout=False, stderr=True))
+            )
+        finally:
+            container.remove(force=True)
+    
+    docker_cmd = [
+        "wsl", "docker", "run",
+        "--rm",                          # Remove container after execution
+        "--network=none",                # No network access
+        f"--memory={MEMORY_LIMIT}",      # Memory limit
+        "--cpus=0.5",                    # CPU limit
+        f"--workdir=/app",               # Working directory
+        f"--volume={execution_dir}:/app:ro",  # Mount code as read-only
+        "--cap-drop=ALL",                # Drop all capabilities
+        "--security-opt=no-new-privileges:true",  # No privilege escalation
+        image
+    ]
+    return subprocess.run(
+        docker_cmd + command,
+        capture_output=True,
+        text=True,
+        timeout=MAX_EXECUTION_TIME
+    )
+
+def start_container():
+    """Start a long-lived sandbox container that executions are run in with docker exec"""
+    if docker_client is not None:
+        return docker_client.containers.run(
+            DOCKER_IMAGE, ["sleep", "infinity"],
+            detach=True,
+            auto_remove=True,
+            network_mode="none",
+            mem_limit=MEMORY_LIMIT,
+            nano_cpus=500000000,
+            pids_limit=CONTAINER_PIDS_LIMIT,
+            user=CONTAINER_USER,
+            read_only=True,
+            tmpfs={"/app": CONTAINER_TMPFS_OPTIONS, "/tmp": CONTAINER_TMPFS_OPTIONS},
+            cap_drop=["ALL"],
+            security_opt=["no-new-privileges:true"],
+            labels={"created_by": "python_executor", "owner": CONTAINER_OWNER}
+        ).id
+    
+    result = subprocess.run([
+        "wsl", "docker", "run",
+        "--detach",
+        "--rm",                          # Remove container once it is stopped
+        "--network=none",                # No network access
+        f"--memory={MEMORY_LIMIT}",      # Memory limit
+        "--cpus=0.5",                    # CPU limit
+        f"--pids-limit={CONTAINER_PIDS_LIMIT}",  # Process limit
+        f"--user={CONTAINER_USER}",      # Run as an unprivileged user
+        "--read-only",                   # Nothing outside the tmpfs mounts is writable
+        f"--tmpfs=/app:{CONTAINER_TMPFS_OPTIONS}",  # Where each run's files are unpacked
+        f"--tmpfs=/tmp:{CONTAINER_TMPFS_OPTIONS}",
+        "--cap-drop=ALL",                # Drop all capabilities
+        "--security-opt=no-new-privileges:true",  # No privilege escalation
+        "--label=created_by=python_executor",
+        f"--label=owner={CONTAINER_OWNER}",  # Lets a later run find leftovers if this process dies
+        DOCKER_IMAGE,
+        "sleep", "infinity"
+    ], capture_output=True, text=True, timeout=60)
+    
+    if result.returncode != 0:
+        raise RuntimeError(f"Failed to start container: {result.stderr.strip()}")
+    
+    return result.stdout.strip()
+
+def stop_container(container_id):
+    """Stop and remove a warm container"""
+    if docker_client is not None:
+        try:
+            docker_client.api.remove_container(container_id, force=True)
+        except docker.errors.APIError:
+            pass
+        return
+    
+    subprocess.run(["wsl", "docker", "rm", "-f", container_id], capture_output=True, text=True)
+
+def process_alive(pid):
+    """Check whether a process on this machine is still running"""
+    if os.name == 'nt':
+        # os.kill would terminate the process on Windows, so ask for its exit code instead
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return kernel32.GetLastError() == 5  # ERROR_ACCESS_DENIED: it exists
+        try:
+            exit_code = ctypes.c_ulong()
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code))
+            return exit_code.value == 259  # STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def remove_stale_containers():
+    """Remove warm containers left behind by server processes on this machine that have since died"""
+    if docker_client is not None:
+        containers = [
+            (container.id, container.labels.get("owner", ""))
+            for container in docker_client.containers.list(all=True, filters={"label": "created_by=python_executor"})
+        ]
+    else:
+        # --exec keeps the format template away from the WSL shell
+        result = subprocess.run(
+            ["wsl", "--exec", "docker", "ps", "--all", "--no-trunc",
+             "--filter", "label=created_by=python_executor",
+             "--format", '{{.ID}} {{.Label "owner"}}'],
+            capture_output=True,
+            text=True
+        )
+        containers = [(line.split(" ", 1) + [""])[:2] for line in result.stdout.splitlines() if line.strip()]
+    
+    for container_id, owner in containers:
+        # Containers of live processes, or of other machines sharing the engine, are left alone
+        hostname, _, pid = owner.rpartition(":")
+        if hostname != socket.gethostname() or not pid.isdigit() or owner == CONTAINER_OWNER:
+            continue
+        if not process_alive(int(pid)):
+            stop_container(container_id)
+
+def pack_execution_dir(execution_dir):
+    """Pack an execution's files into a base64 tar archive for RUN_BOOTSTRAP"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w') as tar:
+        for name in os.listdir(execution_dir):
+            tar.add(os.path.join(execution_dir, name), arcname=name)
+    return base64.b64encode(buffer.getvalue()).decode('ascii')
+
+def exec_in_container(container_id, payload, marker, command):
+    """Unpack payload into /app of a running container and run command there.
+    
+    RUN_BOOTSTRAP writes marker to stderr just before it hands over to the
+    command, so a result whose stderr doesn't start with it never ran it.
+    """
+    if docker_client is not None:
+        # The API has no simple stdin, so the payload travels as arguments
+        chunks = [payload[i:i + ARGUMENT_CHUNK_SIZE] for i in range(0, len(payload), ARGUMENT_CHUNK_SIZE)]
+        bootstrap = ["python", "-c", RUN_BOOTSTRAP, str(len(chunks))] + chunks + [marker] + command
+        try:
+            exec_id = docker_client.api.exec_create(container_id, bootstrap)["Id"]
+            stdout, stderr = wait_for(docker_client.api.exec_start, exec_id, demux=True)
+            exit_code = docker_client.api.exec_inspect(exec_id)["ExitCode"]
+        except docker.errors.APIError as e:
+            return subprocess.CompletedProcess(command, 1, "", f"Error response from daemon: {e.explanation}")
+        return subprocess.CompletedProcess(command, exit_code, decode_output(stdout), decode_output(stderr))
+    
+    # --exec keeps WSL's shell from interpreting the bootstrap code
+    bootstrap = ["python", "-c", RUN_BOOTSTRAP, "0", marker] + command
+    result = subprocess.run(
+        ["wsl", "--exec", "docker", "exec", "--interactive", container_id] + bootstrap,
+        input=payload.encode('ascii'),
+        capture_output=True,
+        timeout=MAX_EXECUTION_TIME
+    )
+    return subprocess.CompletedProcess(command, result.returncode, decode_output(result.stdout), decode_output(result.stderr))
+
+def scrub_container(container_id):
+    """Kill whatever a run left behind and wipe its files, returning whether the container is clean"""
+    command = ["sh", "-c", SCRUB_SCRIPT]
+    if docker_client is not None:
+        try:
+            exec_id = docker_client.api.exec_create(container_id, command)["Id"]
+            wait_for(docker_client.api.exec_start, exec_id, timeout=SCRUB_TIMEOUT)
+            return docker_client.api.exec_inspect(exec_id)["ExitCode"] == 0
+        except (docker.errors.APIError, subprocess.TimeoutExpired):
+            return False
+    
+    try:
+        result = subprocess.run(
+            ["wsl", "--exec", "docker", "exec", container_id] + command,
+            capture_output=True,
+            timeout=SCRUB_TIMEOUT
+        )
+    except subprocess.TimeoutExpired:
+        return False
+    return result.returncode == 0
+
+def acquire_container():
+    """Take a warm container from the pool, starting a new one if none is idle"""
+    try:
+        return container_pool.get_nowait()
+    except queue.Empty:
+        return start_container(), 0
+
+def release_container(container_id, uses):
+    """Return a container to the pool, or stop it if it is worn out or the pool is full"""
+    if uses < MAX_CONTAINER_USES and container_pool.qsize() < CONTAINER_POOL_SIZE:
+        container_pool.put((container_id, uses))
+    else:
+        stop_container(container_id)
+
+def recycle_container(container_id, uses):
+    """Scrub a used container and return it to the pool, replacing it if anything survived"""
+    if scrub_container(container_id):
+        release_container(container_id, uses)
+    else:
+        stop_container(container_id)
+
+def warm_container_pool():
+    """Remove containers leaked by earlier runs, then start containers until the pool holds CONTAINER_POOL_SIZE idle ones"""
+    try:
+        remove_stale_containers()
+        while container_pool.qsize() < CONTAINER_POOL_SIZE:
+            container_pool.put((start_container(), 0))
+    except Exception as e:
+        print(f"Could not start warm containers: {str(e)}", file=sys.stderr)
+
+@atexit.register
+def drain_container_pool():
+    """Stop every idle warm container"""
+    while True:
+        try:
+            container_id, _ = container_pool.get_nowait()
+        except queue.Empty:
+            break
+        stop_container(container_id)
+
+def run_in_container(execution_dir, command):
+    """Run a command on a copy of the execution's files inside a warm container"""
+    payload = pack_execution_dir(execution_dir)
+    if docker_client is not None and len(payload) > MAX_ARGUMENT_PAYLOAD:
+        # Too large to pass as exec arguments
+        return run_fresh_container(execution_dir, command)
+    
+    for attempt in range(2):
+        container_id, uses = acquire_container()
+        marker = uuid.uuid4().hex
+        try:
+            result = exec_in_container(container_id, payload, marker, command)
+        except BaseException:
+            # The command may still be running inside the container
+            stop_container(container_id)
+            raise
+        
+        # Without the marker the script never started (e.g. the container died
+        # while idle), so it is safe to replace the container and try again
+        if not result.stderr.startswith(marker):
+            stop_container(container_id)
+            continue
+        
+        result.stderr = result.stderr[len(marker):]
+        container_scrubbers.submit(recycle_container, container_id, uses + 1)
+        return result
+    
+    return result
+
 @mcp.tool()
 def write_python_file(code: str, filename: str = "script.py") -> str:
     """Write Python code to a file.
@@ -103,48 +565,22 @@ def execute_python_code(execution_id: str, filename: str = "script.py",
         # Parse requirements
         req_list = []
         if requirements:
-            req_list = [pkg.strip() for pkg in requirements.split(",")]
-        
-        # Create requirements.txt if needed
-        if req_list:
-            req_path = os.path.join(execution_dir, "requirements.txt")
-            with open(req_path, 'w', encoding='utf-8') as f:
-                f.write("\n".join(req_list))
+            req_list = [pkg.strip() for pkg in requirements.split(",") if pkg.strip()]
         
-        # Build Docker command
-        docker_cmd = [
-            "wsl", "docker", "run",
-            "--rm",                          # Remove container after execution
-            "--network=none",                # No network access
-            f"--memory={MEMORY_LIMIT}",      # Memory limit
-            "--cpus=0.5",                    # CPU limit
-            f"--workdir=/app",               # Working directory
-            f"--volume={execution_dir}:/app:ro",  # Mount code as read-only
-            "--cap-drop=ALL",                # Drop all capabilities
-            "--security-opt=no-new-privileges:true",  # No privilege escalation
-            DOCKER_IMAGE
-        ]
+        # Requirements are installed into an image once and reused after that
+        image = build_executor_image(req_list) if req_list else None
         
-        # Add pip install if requirements exist
-        full_cmd = docker_cmd.copy()
-        if req_list:
-            full_cmd.extend([
-                "sh", "-c", 
-                f"pip install --no-cache-dir -r requirements.txt && python {safe_filename} {args}"
-            ])
-        else:
-            full_cmd.extend(["python", safe_filename])
-            if args:
-                full_cmd.extend(args.split())
+        command = ["python", safe_filename]
+        if args:
+            command.extend(args.split())
         
         # Execute with timeout
         start_time = time.time()
-        result = subprocess.run(
-            full_cmd, 
-            capture_output=True, 
-            text=True, 
-            timeout=MAX_EXECUTION_TIME
-        )
+        if image:
+            result = run_fresh_container(execution_dir, command, image)
+        else:
+            # Skip container startup by running in a warm container
+            result = run_in_container(execution_dir, command)
         execution_time = time.time() - start_time
         
         # Return results
@@ -233,37 +669,23 @@ def check_docker() -> str:
     """
     try:
         # Check if Docker is installed and running
-        docker_check = subprocess.run(
-            ["wsl", "docker", "ps"], 
-            capture_output=True, 
-            text=True
-        )
+        available, details = docker_available()
         
-        if docker_check.returncode != 0:
+        if not available:
             return json.dumps({
                 "error": "Docker is not available or not running",
-                "details": docker_check.stderr
+                "details": details
             })
         
         # Check if our image exists
-        image_check = subprocess.run(
-            ["docker", "image", "inspect", DOCKER_IMAGE], 
-            capture_output=True, 
-            text=True
-        )
-        
-        if image_check.returncode != 0:
+        if not image_available(DOCKER_IMAGE):
             # Pull the image
-            pull_result = subprocess.run(
-                ["docker", "pull", DOCKER_IMAGE], 
-                capture_output=True, 
-                text=True
-            )
+            pulled, details = pull_image(DOCKER_IMAGE)
             
-            if pull_result.returncode != 0:
+            if not pulled:
                 return json.dumps({
                     "error": f"Failed to pull Docker image {DOCKER_IMAGE}",
-                    "details": pull_result.stderr
+                    "details": details
                 })
             
             return json.dumps({
@@ -312,8 +734,10 @@ if __name__ == "__main__":
                 pass
                 
         print(f"Starting Web MCP server on port {port}")
+        threading.Thread(target=warm_container_pool, daemon=True).start()
         uvicorn.run(app, host="127.0.0.1", port=port)
     else:
         # STDIO mode - for Claude Desktop
         print("Starting STDIO MCP server")
+        threading.Thread(target=warm_container_pool, daemon=True).start()
         mcp.run(transport='stdio')
\ No newline at end of file